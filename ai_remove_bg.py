@@ -1,34 +1,242 @@
 """
 使用 AI (rembg) 去除錢幣圖片背景
 更精確的去背效果
+
+每個 process 只建立一次 rembg session (含模型載入與 ONNX graph 初始化),
+之後的圖片都走已暖機的 session, 並盡可能以 batch 方式推論
+
+Usage:
+    python ai_remove_bg.py
+    python ai_remove_bg.py public/assets/stones "public/assets/dlc/*.jpg" --batch-size 8
+    python ai_remove_bg.py --all --model u2netp --output-dir build/keyed
+    python ai_remove_bg.py scans/ --mask-size 512 --compare-full
 """
-from rembg import remove
-from PIL import Image
+from rembg import new_session
+from PIL import Image, ImageOps
+import numpy as np
+from functools import partial
+import argparse
 import os
+import time
+
+from bg_batch import add_batch_arguments, plan_outputs, resolve_inputs, run_batch
+from bg_manifest import add_manifest_arguments, open_manifest
+
+DEFAULT_MODEL = 'u2net'
+DEFAULT_BATCH_SIZE = 8
+
+# 低解析度遮罩模式: 遮罩放大後以原圖為引導做邊緣修正 (guided filter)
+DEFAULT_REFINE_RADIUS = 4
+DEFAULT_REFINE_EPS = 1e-3
+
+# 可以將多張圖片疊成同一個 batch 推論的模型 (u2net 系列共用相同的前處理)
+U2NET_FAMILY = ('u2net', 'u2netp', 'u2net_human_seg', 'silueta')
+U2NET_MEAN = (0.485, 0.456, 0.406)
+U2NET_STD = (0.229, 0.224, 0.225)
+U2NET_SIZE = (320, 320)
+
+# 每個 process 的常駐 session
+_session = None
+_session_model = None
+
+
+def load_session(model_name=DEFAULT_MODEL):
+    """
+    建立 (或重用) 目前 process 的 rembg session
+
+    第一次呼叫會載入模型並以一張空白圖暖機, 讓 ONNX graph 初始化
+    不算進第一張圖片的推論時間; 載入時間會另外印出
+    """
+    global _session, _session_model
+    if _session is not None and _session_model == model_name:
+        return _session
+
+    start = time.perf_counter()
+    session = new_session(model_name)
+    session.predict(Image.new('RGB', U2NET_SIZE, (255, 255, 255)))
+    elapsed = time.perf_counter() - start
+    print(f'Model {model_name} loaded in {elapsed:.2f} s (pid {os.getpid()})')
+
+    _session, _session_model = session, model_name
+    return session
+
+
+def _normalize_mask(pred, size):
+    """將模型輸出正規化為 0-255 的遮罩並放大回原圖大小 (與 rembg 相同)"""
+    ma, mi = np.max(pred), np.min(pred)
+    pred = (pred - mi) / (ma - mi) if ma > mi else np.zeros_like(pred)
+    mask = Image.fromarray((pred * 255).astype('uint8'))
+    return mask.resize(size, Image.Resampling.LANCZOS)
+
+
+def predict_masks(session, model_name, images):
+    """
+    推論一批圖片的遮罩
+
+    u2net 系列會把整批疊成一個 (N, 3, H, W) tensor 一次送進 ONNX;
+    其他模型或不支援動態 batch 的模型則逐張推論
+    """
+    if model_name in U2NET_FAMILY and len(images) > 1:
+        try:
+            input_name = session.inner_session.get_inputs()[0].name
+            feeds = [session.normalize(img, U2NET_MEAN, U2NET_STD, U2NET_SIZE)[input_name]
+                     for img in images]
+            outputs = session.inner_session.run(None, {input_name: np.concatenate(feeds, axis=0)})
+            return [_normalize_mask(outputs[0][i, 0, :, :], img.size)
+                    for i, img in enumerate(images)]
+        except Exception:
+            pass  # 模型的 batch 維度固定為 1, 退回逐張推論
+    return [session.predict(img)[0] for img in images]
+
+
+def downscale_for_inference(img, mask_size):
+    """將圖片縮小到長邊 mask_size 供推論使用 (原圖已夠小時直接回傳)"""
+    if not mask_size or max(img.size) <= mask_size:
+        return img
+    scale = mask_size / max(img.size)
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    return img.resize(size, Image.Resampling.BOX, reducing_gap=2.0)
+
+
+def _box_filter(x, r):
+    """以積分影像計算 (2r+1)x(2r+1) 視窗平均 (邊界延伸)"""
+    padded = np.pad(x, ((r + 1, r), (r + 1, r)), mode='edge')
+    c = padded.cumsum(axis=0).cumsum(axis=1)
+    k = 2 * r + 1
+    total = c[k:, k:] - c[:-k, k:] - c[k:, :-k] + c[:-k, :-k]
+    return total / (k * k)
+
+
+def refine_mask(mask, img, radius=DEFAULT_REFINE_RADIUS, eps=DEFAULT_REFINE_EPS):
+    """
+    將低解析度遮罩放大到原圖大小, 並以原圖灰階為引導做 guided filter 邊緣修正
+
+    Args:
+        mask: 推論得到的 'L' 遮罩 (任意大小)
+        img: 原始解析度的圖片
+
+    Returns:
+        與 img 同大小的 'L' 遮罩
+    """
+    up = mask.resize(img.size, Image.Resampling.BICUBIC)
+    if mask.size == img.size:
+        return up
+
+    p = np.asarray(up, dtype=np.float64) / 255.0
+    guide = np.asarray(img.convert('L'), dtype=np.float64) / 255.0
+
+    mean_i = _box_filter(guide, radius)
+    mean_p = _box_filter(p, radius)
+    cov_ip = _box_filter(guide * p, radius) - mean_i * mean_p
+    var_i = _box_filter(guide * guide, radius) - mean_i * mean_i
+
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    q = _box_filter(a, radius) * guide + _box_filter(b, radius)
+
+    return Image.fromarray((np.clip(q, 0.0, 1.0) * 255 + 0.5).astype(np.uint8))
+
+
+def cutout(img, mask):
+    """以遮罩作為 alpha, 遮罩外的像素設為全透明"""
+    empty = Image.new('RGBA', img.size, 0)
+    return Image.composite(img.convert('RGBA'), empty, mask)
+
+
+def ai_remove_batch(jobs, model_name=DEFAULT_MODEL, mask_size=None, compare_full=False):
+    """
+    以常駐 session 處理一批 (input, output)
+
+    Args:
+        jobs: (input, output) 清單
+        model_name: rembg 模型名稱
+        mask_size: 指定時在長邊 mask_size 的縮圖上推論遮罩, 再放大並修正邊緣
+        compare_full: 額外以原始解析度推論一次, 只計時不輸出
+
+    Returns:
+        每個檔案的 (input, output, seconds, error, info); seconds 為分攤後的推論時間加上存檔時間,
+        不含模型載入
+    """
+    session = load_session(model_name)
+    results = []
+    loaded = []
+
+    # 讀取圖片
+    for input_path, output_path in jobs:
+        try:
+            img = ImageOps.exif_transpose(Image.open(input_path))
+            loaded.append((input_path, output_path, img))
+        except Exception as e:
+            results.append((input_path, output_path, 0.0, f'{type(e).__name__}: {e}'))
+
+    if not loaded:
+        return results
+
+    # AI 去背 (整批推論)
+    start = time.perf_counter()
+    rgb_images = [downscale_for_inference(img, mask_size).convert('RGB') for _i, _o, img in loaded]
+    masks = predict_masks(session, model_name, rgb_images)
+    if mask_size:
+        masks = [refine_mask(mask, img) for mask, (_i, _o, img) in zip(masks, loaded)]
+    per_image = (time.perf_counter() - start) / len(loaded)
+
+    info = None
+    if compare_full and mask_size:
+        start = time.perf_counter()
+        predict_masks(session, model_name, [img.convert('RGB') for _i, _o, img in loaded])
+        full_per_image = (time.perf_counter() - start) / len(loaded)
+        info = (f'[mask {mask_size}px: {per_image * 1000:.1f} ms, '
+                f'full: {full_per_image * 1000:.1f} ms]')
+
+    # 保存
+    for (input_path, output_path, img), mask in zip(loaded, masks):
+        start = time.perf_counter()
+        cutout(img, mask).save(output_path, 'PNG')
+        results.append((input_path, output_path, per_image + time.perf_counter() - start, None, info))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='使用 rembg 去除圖片背景')
+    add_batch_arguments(parser, default_workers=1)
+    parser.add_argument('--model', '-m', default=DEFAULT_MODEL,
+                        help=f'rembg 模型名稱 (預設: {DEFAULT_MODEL})')
+    parser.add_argument('--batch-size', '-b', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'每次推論的圖片數 (預設: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--mask-size', type=int, default=None,
+                        help='在長邊為此像素數的縮圖上推論遮罩, 再放大並修正邊緣 (預設: 原始解析度)')
+    parser.add_argument('--compare-full', action='store_true',
+                        help='搭配 --mask-size, 額外計時原始解析度推論以供比較')
+    add_manifest_arguments(parser)
+    args = parser.parse_args()
+
+    inputs = resolve_inputs(args)
+    jobs = plan_outputs(inputs, args.output_dir)
 
-# 處理所有錢幣圖片
-stones_dir = 'public/assets/stones'
-files = ['stone-1.png', 'stone-3.png', 'stone-6.png']
+    manifest = open_manifest(args)
+    if manifest:
+        params = {'tool': 'ai_remove_bg', 'model': args.model, 'mask_size': args.mask_size}
+        jobs = manifest.plan(jobs, params, args.force)
 
-for filename in files:
-    input_path = os.path.join(stones_dir, filename)
+    # 單一 process 時先在主 process 載入模型, 讓載入時間與推論時間分開計算
+    if (args.workers or 1) == 1 and jobs:
+        load_session(args.model)
 
-    if os.path.exists(input_path):
-        print(f'Processing: {filename}...')
+    task = partial(ai_remove_batch, model_name=args.model, mask_size=args.mask_size,
+                   compare_full=args.compare_full)
+    results = run_batch(task, jobs, args.workers, batch_size=max(args.batch_size, 1))
 
-        # 讀取圖片
-        with open(input_path, 'rb') as f:
-            input_image = f.read()
+    if manifest:
+        manifest.record(results)
+        manifest.save()
 
-        # AI 去背
-        output_image = remove(input_image)
+    timings = [r.seconds for r in results if r.error is None]
+    if timings:
+        print(f'Inference (warm): {sum(timings) / len(timings) * 1000:.1f} ms/image')
 
-        # 保存
-        with open(input_path, 'wb') as f:
-            f.write(output_image)
+    print('All done! AI background removal completed.')
 
-        print(f'OK: {input_path}')
-    else:
-        print(f'ERROR: File not found: {input_path}')
 
-print('All done! AI background removal completed.')
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+去背腳本共用的批次處理工具
+收集 glob / 目錄下的圖片, 以 process pool 平行處理, 並回報吞吐量
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import os
+import time
+
+# 單一檔案的處理結果; info 為 task 的回傳值 (若有), 會附在進度輸出後面
+BatchResult = namedtuple('BatchResult', 'input output bytes seconds error info')
+
+# 批次模式會處理的圖片副檔名
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+# 整個美術資源樹 (批次模式的常用目標)
+ASSET_DIRS = [
+    'public/assets/stones',
+    'public/assets/cards',
+    'public/assets/dlc',
+    'public/assets/artifacts',
+]
+
+# 未指定路徑時的預設目標: 三個錢幣圖片
+STONES_DIR = 'public/assets/stones'
+DEFAULT_FILES = [os.path.join(STONES_DIR, name) for name in ('stone-1.png', 'stone-3.png', 'stone-6.png')]
+
+
+def add_batch_arguments(parser, default_workers=None):
+    """加入兩個去背腳本共用的批次模式參數"""
+    parser.add_argument('paths', nargs='*',
+                        help='要處理的檔案、目錄或 glob 樣式 (預設: 三個錢幣圖片)')
+    parser.add_argument('--all', action='store_true',
+                        help=f'處理整個美術資源樹: {", ".join(ASSET_DIRS)}')
+    parser.add_argument('--workers', '-j', type=int, default=default_workers,
+                        help=f'平行處理的 process 數量 (預設: {default_workers or "CPU 核心數"})')
+    parser.add_argument('--output-dir', '-o', default=None,
+                        help='輸出目錄 (預設: 就地覆寫)')
+
+
+def resolve_inputs(args):
+    """依據命令列參數決定要處理的圖片清單"""
+    patterns = list(args.paths)
+    if args.all:
+        patterns += ASSET_DIRS
+    if patterns:
+        return collect_images(patterns)
+
+    inputs = []
+    for input_path in DEFAULT_FILES:
+        if os.path.exists(input_path):
+            inputs.append(input_path)
+        else:
+            print(f'ERROR: File not found: {input_path}')
+    return inputs
+
+
+def collect_images(patterns, extensions=IMAGE_EXTENSIONS):
+    """
+    將 glob 樣式或目錄展開為排序後的圖片路徑清單
+
+    Args:
+        patterns: 路徑、目錄或 glob 樣式 (支援 **)
+        extensions: 要納入的副檔名
+
+    Returns:
+        去除重複後排序的檔案路徑清單
+    """
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _dirs, names in os.walk(pattern):
+                for name in names:
+                    if name.lower().endswith(extensions):
+                        found.add(os.path.normpath(os.path.join(root, name)))
+            continue
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and path.lower().endswith(extensions):
+                found.add(os.path.normpath(path))
+    return sorted(found)
+
+
+def output_path_for(input_path, output_dir=None, base_dir=None, suffix='.png'):
+    """
+    計算輸出路徑
+
+    沒有 output_dir 時就地覆寫 (副檔名不同則改存為 suffix);
+    有 output_dir 時保留相對於 base_dir 的目錄結構
+    """
+    root, ext = os.path.splitext(input_path)
+    if ext.lower() != suffix:
+        root_name = root + suffix
+    else:
+        root_name = input_path
+    if output_dir is None:
+        return root_name
+    rel = os.path.relpath(root_name, base_dir) if base_dir else os.path.basename(root_name)
+    return os.path.join(output_dir, rel)
+
+
+def plan_outputs(inputs, output_dir=None, suffix='.png'):
+    """為每個輸入檔決定輸出路徑, 回傳 (input, output) 清單"""
+    base_dir = None
+    if output_dir is not None and inputs:
+        base_dir = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in inputs])
+    jobs = {}
+    for path in inputs:
+        src = os.path.abspath(path) if base_dir else path
+        output_path = output_path_for(src, output_dir, base_dir, suffix)
+        # Ash.jpg 與上次產生的 Ash.png 會指向同一個輸出, 以原始來源為準
+        previous = jobs.get(output_path)
+        if previous is not None and os.path.abspath(path) == os.path.abspath(output_path):
+            continue
+        jobs[output_path] = (path, output_path)
+    return list(jobs.values())
+
+
+def _make_output_dirs(output_paths):
+    for output_path in output_paths:
+        out_dir = os.path.dirname(output_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+
+def _timed_call(task, input_path, output_path, dry_run=False):
+    """在 worker 內執行單一檔案並計時 (需為模組層級函式才能被 pickle)"""
+    size = os.path.getsize(input_path)
+    start = time.perf_counter()
+    try:
+        if not dry_run:
+            _make_output_dirs([output_path])
+        info = task(input_path, output_path)
+        error = None
+    except Exception as e:
+        info = None
+        error = f'{type(e).__name__}: {e}'
+    return BatchResult(input_path, output_path, size, time.perf_counter() - start, error, info)
+
+
+def _timed_chunk(task, chunk, dry_run=False):
+    """
+    在 worker 內執行一批檔案
+
+    task(chunk) 需自行回傳每個檔案的 (input, output, seconds, error[, info]);
+    整批失敗時每個檔案都記錄同一個錯誤
+    """
+    try:
+        if not dry_run:
+            _make_output_dirs(o for _i, o in chunk)
+        timed = task(chunk)
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+        timed = [(i, o, 0.0, error) for i, o in chunk]
+    results = []
+    for i, o, seconds, error, *info in timed:
+        size = os.path.getsize(i) if os.path.exists(i) else 0
+        results.append(BatchResult(i, o, size, seconds, error, info[0] if info else None))
+    return results
+
+
+def _report(result, dry_run=False):
+    if result.error:
+        print(f'ERROR: {result.input}: {result.error}')
+        return
+    mb_per_s = result.bytes / result.seconds / 1e6 if result.seconds > 0 else 0.0
+    # dry run 時什麼都沒寫出, 只列出檢查過的輸入
+    label = f'DRY-RUN: {result.input}' if dry_run else f'OK: {result.output}'
+    line = f'{label} ({result.seconds * 1000:.1f} ms, {mb_per_s:.2f} MB/s)'
+    if result.info is not None:
+        line += f' {result.info}'
+    print(line)
+
+
+def run_batch(task, jobs, workers=None, batch_size=None, dry_run=False):
+    """
+    平行處理所有 (input, output) 工作
+
+    Args:
+        task: 模組層級的可呼叫物件; 未指定 batch_size 時以 task(input_path, output_path) 呼叫,
+              否則以 task(chunk) 呼叫, chunk 為最多 batch_size 筆 (input, output)
+        jobs: (input_path, output_path) 清單
+        workers: process 數量, None 為 CPU 核心數, 1 則在目前 process 內依序執行
+        batch_size: 每次交給 task 的檔案數 (None 表示逐檔呼叫)
+        dry_run: task 不會寫出檔案; 不建立輸出目錄, 進度與統計也標示為 dry run
+
+    Returns:
+        每個檔案的 BatchResult 清單 (依輸入順序)
+    """
+    workers = workers or os.cpu_count() or 1
+    results = {}
+    start = time.perf_counter()
+
+    if batch_size:
+        units = [(_timed_chunk, (task, jobs[i:i + batch_size], dry_run))
+                 for i in range(0, len(jobs), batch_size)]
+    else:
+        units = [(_timed_call, (task, i, o, dry_run)) for i, o in jobs]
+
+    def collect(outcome):
+        for result in (outcome if batch_size else [outcome]):
+            results[(result.input, result.output)] = result
+            _report(result, dry_run)
+
+    if workers == 1 or len(units) <= 1:
+        for func, args in units:
+            collect(func(*args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(func, *args) for func, args in units]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    wall = time.perf_counter() - start
+    ordered = [results[job] for job in jobs]
+    print_summary(ordered, wall, workers, dry_run)
+    return ordered
+
+
+def print_summary(results, wall, workers, dry_run=False):
+    """輸出整批的吞吐量統計"""
+    ok = [r for r in results if r.error is None]
+    failed = len(results) - len(ok)
+    total_bytes = sum(r.bytes for r in ok)
+    cpu_time = sum(r.seconds for r in ok)
+    files_per_s = len(ok) / wall if wall > 0 else 0.0
+    mb_per_s = total_bytes / wall / 1e6 if wall > 0 else 0.0
+    print('-' * 50)
+    status = 'checked (dry run, nothing written)' if dry_run else 'ok'
+    print(f'Files: {len(ok)} {status}, {failed} failed  (workers: {workers})')
+    print(f'Wall time: {wall:.2f} s  (sum of per-file time: {cpu_time:.2f} s)')
+    print(f'Throughput: {files_per_s:.1f} files/s, {mb_per_s:.2f} MB/s')
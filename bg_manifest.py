@@ -0,0 +1,157 @@
+"""
+去背腳本的增量處理 manifest
+記錄每個資源的來源雜湊、處理參數與輸出雜湊, 未變動的檔案直接跳過
+
+就地處理時會先把未處理的原圖以內容雜湊保存到 originals/,
+之後不論參數怎麼改都從原圖重新處理, 去背效果不會一再疊加
+"""
+import hashlib
+import json
+import os
+import shutil
+
+DEFAULT_CACHE_DIR = '.bg-cache'
+MANIFEST_VERSION = 1
+
+
+def file_hash(path):
+    """計算檔案內容的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _key(path):
+    """manifest 內使用的路徑 (相對於目前目錄, 以 / 分隔)"""
+    return os.path.relpath(path).replace(os.sep, '/')
+
+
+def add_manifest_arguments(parser, default_cache_dir=DEFAULT_CACHE_DIR):
+    """加入 manifest 相關的命令列參數"""
+    parser.add_argument('--cache-dir', default=default_cache_dir,
+                        help=f'manifest 與原圖備份的目錄 (預設: {default_cache_dir})')
+    parser.add_argument('--force', action='store_true',
+                        help='忽略 manifest, 全部重新處理')
+    parser.add_argument('--no-manifest', action='store_true',
+                        help='不使用 manifest (每次都直接處理輸入檔)')
+
+
+def open_manifest(args):
+    """依命令列參數開啟 manifest, --no-manifest 時回傳 None"""
+    if args.no_manifest:
+        return None
+    return Manifest(args.cache_dir)
+
+
+class Manifest:
+    """資源處理紀錄, 以輸出路徑為 key"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, 'manifest.json')
+        self.originals_dir = os.path.join(cache_dir, 'originals')
+        self.assets = {}
+        self.skipped = []
+        self._pending = {}
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.assets = data.get('assets', {})
+
+    def _store_original(self, path, digest):
+        """以內容雜湊保存原圖 (相同內容只存一份)"""
+        ext = os.path.splitext(path)[1].lower()
+        original = os.path.join(self.originals_dir, digest + ext)
+        if not os.path.exists(original):
+            os.makedirs(self.originals_dir, exist_ok=True)
+            shutil.copyfile(path, original)
+        return original
+
+    def plan(self, jobs, params, force=False, store_originals=True):
+        """
+        過濾出需要處理的工作
+
+        Args:
+            jobs: (input, output) 清單
+            params: 會影響輸出的處理參數 (dict)
+            force: 忽略紀錄, 全部重新處理
+            store_originals: 就地處理時保存原圖; False 時 (例如只評分) 不寫入快取目錄
+
+        Returns:
+            實際要執行的 (input, output) 清單; input 可能被換成保存的原圖
+        """
+        todo = []
+        for input_path, output_path in jobs:
+            entry = self.assets.get(_key(output_path))
+            current = file_hash(input_path)
+            in_place = os.path.abspath(input_path) == os.path.abspath(output_path)
+
+            if in_place:
+                # 目前檔案就是上次的輸出 -> 來源沒變, 從保存的原圖處理
+                if entry and current == entry['output_hash'] and os.path.exists(entry['original']):
+                    source_hash, original = entry['source_hash'], entry['original']
+                elif store_originals:
+                    source_hash, original = current, self._store_original(input_path, current)
+                else:
+                    source_hash, original = current, input_path
+            else:
+                source_hash, original = current, input_path
+
+            unchanged = (
+                entry is not None
+                and entry['source_hash'] == source_hash
+                and entry['params'] == params
+                and os.path.exists(output_path)
+                and (in_place or file_hash(output_path) == entry['output_hash'])
+            )
+            if unchanged and not force:
+                self.skipped.append(output_path)
+                continue
+
+            self._pending[(original, output_path)] = {
+                'source': _key(input_path),
+                'source_hash': source_hash,
+                'original': original.replace(os.sep, '/'),
+                'params': params,
+            }
+            todo.append((original, output_path))
+
+        if self.skipped:
+            print(f'Skipped (unchanged): {len(self.skipped)}')
+        return todo
+
+    def record(self, results):
+        """以 run_batch 的結果更新紀錄 (只記錄成功的檔案)"""
+        for result in results:
+            pending = self._pending.pop((result.input, result.output), None)
+            if pending is None or result.error:
+                continue
+            self.assets[_key(result.output)] = {**pending, 'output_hash': file_hash(result.output)}
+
+    def refresh_outputs(self, paths):
+        """
+        其他工具改寫了已記錄的輸出 (例如 optimize_assets 就地最佳化) 後更新輸出雜湊,
+        下次執行時才會認得它仍是上次的輸出, 而不是把它當成新的原圖再處理一次
+
+        Returns:
+            更新的紀錄數
+        """
+        updated = 0
+        for path in paths:
+            entry = self.assets.get(_key(path))
+            if entry is not None and os.path.exists(path):
+                entry['output_hash'] = file_hash(path)
+                updated += 1
+        return updated
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'assets': self.assets},
+                      f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,207 @@
+"""
+去背後的資源最佳化
+裁掉完全透明的外框, 並在感知誤差預算內量化為含 alpha 的索引色 PNG
+
+Usage:
+    python optimize_assets.py
+    python optimize_assets.py public/assets/stones --max-error 3.0 --report build/optimize-report.json
+    python optimize_assets.py --all --no-crop --output-dir build/optimized
+"""
+from PIL import Image
+import numpy as np
+from functools import partial
+import argparse
+import io
+import json
+import os
+
+from bg_batch import add_batch_arguments, plan_outputs, resolve_inputs, run_batch
+from bg_manifest import DEFAULT_CACHE_DIR as BG_CACHE_DIR, Manifest, add_manifest_arguments, open_manifest
+
+# 感知誤差預算: 可見像素上以 alpha 預乘、依亮度權重計算的 RMSE (0-255), 4.5 約為 PSNR 35 dB
+DEFAULT_MAX_ERROR = 4.5
+
+# 依序嘗試的調色盤大小, 取第一個落在預算內的
+PALETTE_SIZES = (16, 32, 64, 128, 256)
+
+# 亮度權重 (Rec. 601), alpha 差異與亮度同權重
+CHANNEL_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float64)
+
+DEFAULT_REPORT = 'optimize-report.json'
+DEFAULT_CACHE_DIR = os.path.join('.bg-cache', 'optimize')
+
+
+class OptimizeResult:
+    """單一檔案的最佳化結果"""
+
+    def __init__(self, before, after, crop, colors, error):
+        self.before = before
+        self.after = after
+        self.crop = crop
+        self.colors = colors
+        self.error = error
+
+    def as_dict(self):
+        return {
+            'bytesBefore': self.before,
+            'bytesAfter': self.after,
+            'bytesSaved': self.before - self.after,
+            'crop': self.crop,
+            'colors': self.colors,
+            'error': round(self.error, 3),
+        }
+
+    def __str__(self):
+        colors = f'{self.colors} colors' if self.colors else 'truecolor'
+        saved = self.before - self.after
+        return f'[{self.before} -> {self.after} bytes, -{saved}, {colors}]'
+
+
+def perceptual_error(reference, candidate):
+    """
+    兩張 RGBA 圖片的感知誤差
+
+    先以 alpha 預乘 (透明像素的顏色不可見), 再以亮度權重計算 RMSE;
+    只統計任一方可見的像素, 裁切與否不影響結果
+    """
+    ref = np.asarray(reference, dtype=np.float64)
+    cand = np.asarray(candidate, dtype=np.float64)
+    visible = (ref[..., 3] > 0) | (cand[..., 3] > 0)
+    if not visible.any():
+        return 0.0
+    ref_rgb = ref[..., :3] * (ref[..., 3:] / 255.0)
+    cand_rgb = cand[..., :3] * (cand[..., 3:] / 255.0)
+    color = ((ref_rgb - cand_rgb) ** 2 * CHANNEL_WEIGHTS).sum(axis=-1)
+    alpha = (ref[..., 3] - cand[..., 3]) ** 2
+    return float(np.sqrt((color + alpha)[visible].mean() / 2.0))
+
+
+def _png_bytes(img):
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _quantize(img, colors):
+    """量化為含 alpha 的調色盤; 有 libimagequant 時優先使用 (品質較好)"""
+    try:
+        return img.quantize(colors=colors, method=Image.Quantize.LIBIMAGEQUANT,
+                            dither=Image.Dither.NONE)
+    except ValueError:
+        return img.quantize(colors=colors, method=Image.Quantize.FASTOCTREE,
+                            dither=Image.Dither.NONE)
+
+
+def quantize_within_budget(img, max_error=DEFAULT_MAX_ERROR):
+    """
+    找出誤差在預算內的最小調色盤
+
+    Returns:
+        (PNG bytes, 顏色數, 誤差); 沒有調色盤符合預算時回傳 truecolor 版本, 顏色數為 None
+    """
+    for colors in PALETTE_SIZES:
+        quantized = _quantize(img, colors)
+        error = perceptual_error(img, quantized.convert('RGBA'))
+        if error <= max_error:
+            return _png_bytes(quantized), colors, error
+    return _png_bytes(img), None, 0.0
+
+
+def optimize_asset(input_path, output_path, max_error=DEFAULT_MAX_ERROR, crop=True):
+    """
+    裁切透明外框並量化, 只有在檔案變小時才寫出最佳化版本
+
+    Returns:
+        OptimizeResult
+    """
+    before = os.path.getsize(input_path)
+    img = Image.open(input_path).convert('RGBA')
+
+    box = None
+    if crop:
+        bbox = img.getchannel('A').getbbox()
+        if bbox and bbox != (0, 0, img.width, img.height):
+            img = img.crop(bbox)
+            box = list(bbox)
+
+    data, colors, error = quantize_within_budget(img, max_error)
+
+    if len(data) >= before:
+        # 沒有變小: 保留原檔
+        if os.path.abspath(input_path) != os.path.abspath(output_path):
+            with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+                dst.write(src.read())
+        return OptimizeResult(before, before, None, None, 0.0)
+
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    return OptimizeResult(before, len(data), box, colors, error)
+
+
+def write_report(results, report_path):
+    """輸出每個檔案節省的位元組數 (與既有報告合併, 被 manifest 跳過的檔案保留上次的紀錄)"""
+    files = {}
+    if os.path.exists(report_path):
+        with open(report_path, 'r', encoding='utf-8') as f:
+            files = json.load(f).get('files', {})
+    for r in results:
+        if r.error is None:
+            files[r.output.replace(os.sep, '/')] = r.info.as_dict()
+    before = sum(f['bytesBefore'] for f in files.values())
+    after = sum(f['bytesAfter'] for f in files.values())
+    report = {
+        'files': files,
+        'totals': {'bytesBefore': before, 'bytesAfter': after, 'bytesSaved': before - after},
+    }
+    report_dir = os.path.dirname(report_path)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f'Saved {before - after} of {before} bytes ({(before - after) / before:.0%})'
+          if before else 'Nothing to optimize')
+    print(f'Report: {report_path}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='裁切透明外框並量化去背後的 PNG')
+    parser.add_argument('--max-error', type=float, default=DEFAULT_MAX_ERROR,
+                        help=f'感知誤差預算 RMSE 0-255 (預設: {DEFAULT_MAX_ERROR})')
+    parser.add_argument('--no-crop', action='store_true',
+                        help='不裁切透明外框')
+    parser.add_argument('--report', default=DEFAULT_REPORT,
+                        help=f'節省位元組報告的輸出路徑 (預設: {DEFAULT_REPORT})')
+    add_batch_arguments(parser)
+    add_manifest_arguments(parser, default_cache_dir=DEFAULT_CACHE_DIR)
+    parser.add_argument('--bg-cache-dir', default=BG_CACHE_DIR,
+                        help=f'去背腳本的 manifest 目錄, 就地最佳化後同步其輸出雜湊; --no-manifest 時不碰 (預設: {BG_CACHE_DIR})')
+    args = parser.parse_args()
+
+    # 只處理 PNG (去背腳本的輸出)
+    inputs = [p for p in resolve_inputs(args) if p.lower().endswith('.png')]
+    jobs = plan_outputs(inputs, args.output_dir)
+
+    manifest = open_manifest(args)
+    if manifest:
+        params = {'tool': 'optimize_assets', 'max_error': args.max_error, 'crop': not args.no_crop}
+        jobs = manifest.plan(jobs, params, args.force)
+
+    task = partial(optimize_asset, max_error=args.max_error, crop=not args.no_crop)
+    results = run_batch(task, jobs, args.workers)
+
+    if manifest:
+        manifest.record(results)
+        manifest.save()
+
+        # 就地改寫了去背腳本的輸出: 讓去背 manifest 認得最佳化後的檔案, 避免下次被當成新原圖重複處理
+        # (只更新去背工具產生過的檔案; 沒有相符紀錄時不會寫入)
+        bg_manifest = Manifest(args.bg_cache_dir)
+        if bg_manifest.refresh_outputs([r.output for r in results if r.error is None]):
+            bg_manifest.save()
+
+    write_report(results, args.report)
+    print('All done!')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,47 +1,295 @@
 """
 去除錢幣圖片背景的腳本
 將白色背景轉為透明
+
+Usage:
+    python remove_bg.py [--threshold 240] [--engine numpy|python]
+    python remove_bg.py public/assets/stones "public/assets/cards/*.png" --workers 8
+    python remove_bg.py --all --output-dir build/keyed
+    python remove_bg.py scans/ --max-memory 64
+    python remove_bg.py public/assets/stones --mode flood --softness 40
 """
 from PIL import Image
-import os
+import numpy as np
+from functools import partial
+import argparse
 
-def remove_white_background(input_path, output_path):
-    """將白色背景轉為透明"""
-    # 開啟圖片
-    img = Image.open(input_path).convert('RGBA')
+from bg_batch import add_batch_arguments, plan_outputs, resolve_inputs, run_batch
+from bg_manifest import add_manifest_arguments, open_manifest
 
-    # 獲取圖片數據
-    datas = img.getdata()
+# 預設白色門檻: RGB 三個通道都大於此值即視為背景
+DEFAULT_THRESHOLD = 240
 
-    # 新數據列表
-    new_data = []
+# 透明像素 (與舊版輸出一致)
+TRANSPARENT = (255, 255, 255, 0)
+
+# 去背暫存緩衝區的預設記憶體上限 (MB), 超過就改用條帶處理
+DEFAULT_MAX_MEMORY_MB = 256
+
+# flood 模式: 只去除與圖片外框連通的白色區域, 邊緣以 alpha 漸層羽化
+DEFAULT_SOFTNESS = 40
+DEFAULT_FEATHER = 2
+
+# 每個像素的暫存成本 (bytes): 裁切條帶 + numpy 陣列 + 比較結果與遮罩 + 寫回用的 Image
+_WORK_BYTES_PER_PIXEL = 16
+
+
+def key_white_pixels(rgba, threshold=DEFAULT_THRESHOLD):
+    """
+    向量化去背: 將 RGBA 陣列中接近白色的像素設為透明 (就地修改)
 
-    # 遍歷每個像素
-    for item in datas:
-        # 如果是白色或接近白色(RGB > 240),則設為透明
-        if item[0] > 240 and item[1] > 240 and item[2] > 240:
-            new_data.append((255, 255, 255, 0))  # 透明
+    Args:
+        rgba: shape 為 (H, W, 4) 的 uint8 陣列
+        threshold: 白色門檻, RGB 皆 > threshold 的像素會被去除
+
+    Returns:
+        修改後的同一個陣列
+    """
+    mask = (rgba[..., :3] > threshold).all(axis=-1)
+    rgba[mask] = TRANSPARENT
+    return rgba
+
+
+def _key_white_pixels_python(img, threshold=DEFAULT_THRESHOLD):
+    """逐像素的舊版實作, 保留作為 numpy 引擎的對照組"""
+    new_data = []
+    for item in img.getdata():
+        if item[0] > threshold and item[1] > threshold and item[2] > threshold:
+            new_data.append(TRANSPARENT)
         else:
             new_data.append(item)
-
-    # 更新圖片數據
     img.putdata(new_data)
+    return img
+
+
+def strip_rows(width, max_memory_mb=DEFAULT_MAX_MEMORY_MB):
+    """計算在記憶體上限內, 每個條帶可以處理幾列"""
+    budget = int(max_memory_mb * 1024 * 1024)
+    return max(1, budget // (width * _WORK_BYTES_PER_PIXEL))
+
+
+def key_white_pixels_tiled(img, threshold=DEFAULT_THRESHOLD, max_memory_mb=DEFAULT_MAX_MEMORY_MB):
+    """
+    以水平條帶逐段去背 (就地修改 RGBA 圖片)
+
+    每次只為一個條帶配置暫存陣列, 暫存記憶體不超過 max_memory_mb;
+    圖片本身仍會解碼一次 (PNG 無法部分解碼)
+    """
+    width, height = img.size
+    rows = strip_rows(width, max_memory_mb)
+    for top in range(0, height, rows):
+        box = (0, top, width, min(top + rows, height))
+        strip = np.array(img.crop(box), dtype=np.uint8)
+        key_white_pixels(strip, threshold)
+        img.paste(Image.fromarray(strip), box)
+    return img
+
+
+def border_connected(mask):
+    """
+    找出 mask 中與圖片外框 4-連通的區域
+
+    以 numpy 將每一列切成連續的 run, 再以 union-find 合併上下重疊的 run,
+    Python 迴圈只跑在 run 上 (遠少於像素數)
+
+    Args:
+        mask: shape 為 (H, W) 的 bool 陣列
+
+    Returns:
+        同 shape 的 bool 陣列
+    """
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    diff = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(diff == 1)
+    _rows, ends = np.nonzero(diff == -1)
+    rows, starts, ends = rows.tolist(), starts.tolist(), ends.tolist()
+    row_ptr = np.searchsorted(np.asarray(rows, dtype=np.int64), np.arange(height + 1)).tolist()
+
+    parent = list(range(len(starts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # 合併相鄰兩列中水平範圍重疊的 run
+    for row in range(height - 1):
+        a, a_end = row_ptr[row], row_ptr[row + 1]
+        b, b_end = row_ptr[row + 1], row_ptr[row + 2]
+        while a < a_end and b < b_end:
+            if starts[a] < ends[b] and starts[b] < ends[a]:
+                ra, rb = find(a), find(b)
+                if ra != rb:
+                    parent[ra] = rb
+            if ends[a] < ends[b]:
+                a += 1
+            else:
+                b += 1
+
+    touching = set()
+    for i, (row, start, end) in enumerate(zip(rows, starts, ends)):
+        if row == 0 or row == height - 1 or start == 0 or end == width:
+            touching.add(find(i))
+
+    connected = np.zeros_like(mask, dtype=bool)
+    for i, (row, start, end) in enumerate(zip(rows, starts, ends)):
+        if find(i) in touching:
+            connected[row, start:end] = True
+    return connected
+
+
+def _dilate(mask, steps):
+    """以 4-鄰域位移做 steps 次膨脹"""
+    for _ in range(steps):
+        grown = mask.copy()
+        grown[1:] |= mask[:-1]
+        grown[:-1] |= mask[1:]
+        grown[:, 1:] |= mask[:, :-1]
+        grown[:, :-1] |= mask[:, 1:]
+        mask = grown
+    return mask
+
+
+def key_border_white(rgba, threshold=DEFAULT_THRESHOLD, softness=DEFAULT_SOFTNESS,
+                     feather=DEFAULT_FEATHER):
+    """
+    flood 模式去背: 只去除與外框連通的白色區域, 內部的白色高光保留 (就地修改)
+
+    背景區域設為透明; 背景周圍 feather 像素內的像素依白色程度給 alpha 漸層:
+    最暗通道 >= threshold 為全透明, <= threshold - softness 為不透明
+
+    Args:
+        rgba: shape 為 (H, W, 4) 的 uint8 陣列
+        threshold: 白色門檻
+        softness: alpha 漸層的寬度 (灰階值)
+        feather: 漸層作用範圍 (距離背景的像素數)
+    """
+    whiteness = rgba[..., :3].min(axis=-1)
+    background = border_connected(whiteness > threshold)
+
+    if softness > 0 and feather > 0:
+        band = _dilate(background, feather) & ~background
+        ramp = (threshold - whiteness[band].astype(np.float32)) / softness
+        ramp_alpha = (np.clip(ramp, 0.0, 1.0) * 255 + 0.5).astype(np.uint8)
+        rgba[..., 3][band] = np.minimum(rgba[..., 3][band], ramp_alpha)
+
+    rgba[background] = TRANSPARENT
+    return rgba
+
+
+def open_rgba(input_path):
+    """開啟圖片並轉為 RGBA (已是 RGBA 時不再多複製一份)"""
+    img = Image.open(input_path)
+    if img.mode != 'RGBA':
+        return img.convert('RGBA')
+    img.load()
+    return img
+
+
+def key_image(img, threshold=DEFAULT_THRESHOLD, engine='numpy', max_memory_mb=DEFAULT_MAX_MEMORY_MB,
+              mode='threshold', softness=DEFAULT_SOFTNESS, feather=DEFAULT_FEATHER):
+    """
+    對 RGBA 圖片就地去背
+
+    Args:
+        img: RGBA 圖片
+        threshold: 白色門檻 (預設 240)
+        engine: 'numpy' (向量化) 或 'python' (逐像素, 舊版行為)
+        max_memory_mb: 去背暫存的記憶體上限, 整張處理會超過時改用條帶處理
+        mode: 'threshold' (所有白色像素) 或 'flood' (只去除與外框連通的白色, 需整張處理)
+        softness / feather: flood 模式的 alpha 漸層參數
+    """
+    width, height = img.size
+    if mode == 'flood':
+        rgba = np.array(img, dtype=np.uint8)
+        key_border_white(rgba, threshold, softness, feather)
+        img.frombytes(rgba.tobytes())
+    elif engine == 'python':
+        _key_white_pixels_python(img, threshold)
+    elif width * height * _WORK_BYTES_PER_PIXEL > max_memory_mb * 1024 * 1024:
+        key_white_pixels_tiled(img, threshold, max_memory_mb)
+    else:
+        # 直接在 RGBA 緩衝區上運算, 再寫回同一個 Image 以保留 info (輸出逐位元組一致)
+        rgba = np.array(img, dtype=np.uint8)
+        key_white_pixels(rgba, threshold)
+        img.frombytes(rgba.tobytes())
+    return img
+
+
+def remove_white_background(input_path, output_path, threshold=DEFAULT_THRESHOLD, engine='numpy',
+                            max_memory_mb=DEFAULT_MAX_MEMORY_MB, mode='threshold',
+                            softness=DEFAULT_SOFTNESS, feather=DEFAULT_FEATHER):
+    """
+    將白色背景轉為透明
+
+    Args:
+        input_path: 輸入圖片路徑
+        output_path: 輸出 PNG 路徑
+        threshold: 白色門檻 (預設 240)
+        engine: 'numpy' (向量化) 或 'python' (逐像素, 舊版行為)
+        max_memory_mb: 去背暫存的記憶體上限, 整張處理會超過時改用條帶處理
+        mode: 'threshold' 或 'flood'
+        softness / feather: flood 模式的 alpha 漸層參數
+    """
+    img = open_rgba(input_path)
+    key_image(img, threshold, engine, max_memory_mb, mode, softness, feather)
 
     # 保存
     img.save(output_path, 'PNG')
-    print(f'OK: {output_path}')
 
-# 處理所有錢幣圖片
-stones_dir = 'public/assets/stones'
-files = ['stone-1.png', 'stone-3.png', 'stone-6.png']
 
-for filename in files:
-    input_path = os.path.join(stones_dir, filename)
-    output_path = os.path.join(stones_dir, filename)
+def add_mode_arguments(parser):
+    """加入去背模式相關的命令列參數"""
+    parser.add_argument('--mode', choices=['threshold', 'flood'], default='threshold',
+                        help='threshold: 去除所有白色像素; flood: 只去除與外框連通的白色 (預設: threshold)')
+    parser.add_argument('--softness', type=int, default=DEFAULT_SOFTNESS,
+                        help=f'flood 模式 alpha 漸層寬度 (預設: {DEFAULT_SOFTNESS})')
+    parser.add_argument('--feather', type=int, default=DEFAULT_FEATHER,
+                        help=f'flood 模式漸層作用的像素範圍 (預設: {DEFAULT_FEATHER})')
+
+
+def mode_params(args):
+    """命令列的去背模式參數 (threshold 模式不帶漸層參數, manifest 紀錄維持不變)"""
+    if args.mode == 'threshold':
+        return {}
+    return {'mode': args.mode, 'softness': args.softness, 'feather': args.feather}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='將錢幣圖片的白色背景轉為透明')
+    parser.add_argument('--threshold', '-t', type=int, default=DEFAULT_THRESHOLD,
+                        help=f'白色門檻 0-255 (預設: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--engine', choices=['numpy', 'python'], default='numpy',
+                        help='去背引擎 (預設: numpy)')
+    parser.add_argument('--max-memory', type=float, default=DEFAULT_MAX_MEMORY_MB,
+                        help=f'每個 worker 去背暫存的記憶體上限 MB (預設: {DEFAULT_MAX_MEMORY_MB})')
+    add_mode_arguments(parser)
+    add_batch_arguments(parser)
+    add_manifest_arguments(parser)
+    args = parser.parse_args()
+
+    inputs = resolve_inputs(args)
+    jobs = plan_outputs(inputs, args.output_dir)
+
+    # 只有會影響輸出的參數才記入 manifest (兩種引擎輸出相同)
+    manifest = open_manifest(args)
+    if manifest:
+        params = {'tool': 'remove_bg', 'threshold': args.threshold, **mode_params(args)}
+        jobs = manifest.plan(jobs, params, args.force)
+
+    task = partial(remove_white_background, threshold=args.threshold, engine=args.engine,
+                   max_memory_mb=args.max_memory, **mode_params(args))
+    results = run_batch(task, jobs, args.workers)
+
+    if manifest:
+        manifest.record(results)
+        manifest.save()
+
+    print('All done!')
 
-    if os.path.exists(input_path):
-        remove_white_background(input_path, output_path)
-    else:
-        print(f'ERROR: File not found: {input_path}')
 
-print('All done!')
+if __name__ == '__main__':
+    main()
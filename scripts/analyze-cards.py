@@ -4,7 +4,9 @@ Card Image Analyzer for The Vale of Eternity
 Extracts card information from images using OCR and image processing.
 
 Usage:
-    python analyze-cards.py [--input-dir PATH] [--output FILE] [--verbose]
+    python analyze-cards.py [--input-dir PATH] [--output FILE] [--verbose] [--jobs N] [--fields LIST]
+    python analyze-cards.py --stream [--resume] [--output FILE]
+    python analyze-cards.py --verify cards-database.json [--reference-dir PATH]
 
 @version 1.0.0
 """
@@ -13,10 +15,14 @@ import os
 import sys
 import json
 import re
+import zlib
+import time
 import argparse
 import logging
 from pathlib import Path
-from typing import Optional
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Optional
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
@@ -26,6 +32,12 @@ except ImportError:
     print("Error: Pillow not installed. Run: pip install Pillow")
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    print("Error: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
 try:
     import pytesseract
 except ImportError:
@@ -33,6 +45,15 @@ except ImportError:
     print("Also ensure Tesseract OCR is installed on your system.")
     sys.exit(1)
 
+from asset_index import file_hash, get_asset_index
+from element_colors import get_element_classifier
+from effect_symbols import get_symbol_detector
+from digit_badges import get_digit_classifier
+from phash_index import PerceptualIndex, DEFAULT_MAX_DISTANCE, DUPLICATE_DISTANCE
+from name_index import NameIndex
+from ocr_backends import BACKEND_NAMES, available_backends, get_ocr_backend
+from ocr_cache import DEFAULT_CACHE, DEFAULT_MAX_MB, configure_ocr_cache, get_ocr_cache, ocr_cache_settings
+
 
 # ============================================
 # Configuration
@@ -46,11 +67,51 @@ DEFAULT_OUTPUT_FILE = Path(r"D:\claude-mode\the-vale-of-eternity\scripts\extract
 # Update this path if Tesseract is installed elsewhere
 TESSERACT_CMD_WINDOWS = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
+# Bump when preprocess_image or the OCR crops change, to invalidate cached OCR results
+PREPROCESS_VERSION = 3
+
+# Single-pass layout OCR: upscale factor for the full-card pass, and the
+# tesseract word confidence (0-100) below which a field is re-read on its own
+LAYOUT_SCALE = 2
+LOW_CONFIDENCE = 60
+
+# Fields analyze_card_image can extract (--fields). raw_text is a full-card
+# OCR pass and is only computed when requested (or in verbose mode)
+FIELDS = ["element", "cost", "score", "effect_type", "effect_description", "raw_text"]
+DEFAULT_FIELDS = ("element", "cost", "score", "effect_type", "effect_description")
+
+# OCR escalation tiers, cheapest first: (tier, tesseract config, extra upscale).
+# A field only moves on to the next tier while its words read below
+# LOW_CONFIDENCE
+NUMBER_TIERS = [
+    ("ocr", "--psm 10 --oem 3 -c tessedit_char_whitelist=0123456789", 1),       # single character
+    ("ocr-line", "--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789", 1),   # two-digit values
+]
+TEXT_TIERS = [
+    ("ocr", "--psm 6 --oem 3", 1),
+    ("ocr-upscaled", "--psm 6 --oem 3", 2),
+    ("ocr-sparse", "--psm 11 --oem 3", 2),
+]
+SYMBOL_TIERS = [
+    ("ocr", "--psm 10 --oem 3", 1),
+]
+
+# OCR preprocessing: contrast factor for the grayscale plane, and the
+# upscale factor and binarization threshold for number regions
+CONTRAST_FACTOR = 2.0
+NUMBER_SCALE = 3
+BINARIZE_THRESHOLD = 128
+BINARIZE_LUT = [255 if x > BINARIZE_THRESHOLD else 0 for x in range(256)]
+NUMBER_REGION_TYPES = ("number", "cost", "score")
+
+# Largest number of same-size images stacked into one array in --batch mode
+BATCH_SIZE = 256
+
 # Card image regions (relative to 200px wide card)
 # These are approximate regions based on the card layout
 CARD_REGIONS = {
-    "cost": (5, 35, 35, 75),           # Left side, top area
-    "score": (165, 255, 195, 290),     # Right side, bottom area
+    "cost": (5, 32, 40, 72),           # Left side, top area
+    "score": (134, 242, 164, 274),     # Right side, bottom area (left of the element circle)
     "name": (10, 165, 190, 195),       # Center, below image
     "effect_icon": (10, 200, 45, 235), # Left side, effect area
     "effect_text": (45, 200, 190, 260) # Right of icon, effect area
@@ -86,6 +147,17 @@ class CardEffect:
     description: str
 
 
+@dataclass
+class VisualFields:
+    """Fields read from the card art without OCR (None where a classifier is unavailable, unsure or not asked)"""
+    element: Optional[str] = None
+    cost: Optional[int] = None
+    score: Optional[int] = None
+    number_scores: dict = field(default_factory=dict)
+    effect_type: Optional[str] = None
+    effect_symbol_score: Optional[float] = None
+
+
 @dataclass
 class ExtractedCard:
     """Extracted card data from image"""
@@ -98,6 +170,12 @@ class ExtractedCard:
     effect_description: str = ""
     raw_text: str = ""
     confidence: float = 0.0
+    effect_symbol_score: Optional[float] = None
+    number_scores: dict = field(default_factory=dict)
+    preprocess_ms: float = 0.0
+    field_tiers: dict = field(default_factory=dict)
+    ocr_calls: int = 0
+    ocr_cache_hits: int = 0
     errors: list = field(default_factory=list)
 
 
@@ -126,6 +204,57 @@ def setup_tesseract() -> bool:
     return True  # Linux/Mac usually have tesseract in PATH
 
 
+class PreprocessedCard:
+    """
+    OCR-ready planes of one decoded card, shared by every region.
+
+    Grayscale conversion, contrast and sharpening run once over the whole
+    card on first use; regions are then cropped as views of the sharpened
+    plane. Time spent here is accumulated in `seconds`.
+    """
+
+    def __init__(self, image: Image.Image):
+        self.image = image if image.mode == "RGB" else image.convert("RGB")
+        self.seconds = 0.0
+        self._sharpened: Optional[np.ndarray] = None
+
+    @property
+    def sharpened(self) -> np.ndarray:
+        """Contrast-enhanced, sharpened grayscale plane of the whole card"""
+        if self._sharpened is None:
+            start = time.perf_counter()
+            gray = self.image.convert("L")
+            enhanced = ImageEnhance.Contrast(gray).enhance(CONTRAST_FACTOR)
+            self._sharpened = np.asarray(enhanced.filter(ImageFilter.SHARPEN))
+            self.seconds += time.perf_counter() - start
+        return self._sharpened
+
+    def region(self, region: Optional[tuple] = None, region_type: str = "general") -> Image.Image:
+        """
+        Preprocessed crop for OCR.
+
+        Args:
+            region: (left, top, right, bottom) in card coordinates, None for the whole card
+            region_type: "number" (or "cost"/"score") regions are upscaled and binarized
+        """
+        plane = self.sharpened
+        start = time.perf_counter()
+        if region is not None:
+            left, top, right, bottom = region
+            plane = plane[max(top, 0):bottom, max(left, 0):right]
+        processed = Image.fromarray(plane)
+
+        if region_type in NUMBER_REGION_TYPES:
+            # Increase size for better digit recognition, then binarize
+            # through the lookup table
+            width, height = processed.size
+            processed = processed.resize((width * NUMBER_SCALE, height * NUMBER_SCALE), Image.Resampling.LANCZOS)
+            processed = processed.point(BINARIZE_LUT)
+
+        self.seconds += time.perf_counter() - start
+        return processed
+
+
 def preprocess_image(image: Image.Image, region_type: str = "general") -> Image.Image:
     """
     Preprocess image for better OCR results.
@@ -137,57 +266,100 @@ def preprocess_image(image: Image.Image, region_type: str = "general") -> Image.
     Returns:
         Preprocessed PIL Image
     """
-    # Convert to RGB if necessary
-    if image.mode != "RGB":
-        image = image.convert("RGB")
+    return PreprocessedCard(image).region(None, region_type)
 
-    # Convert to grayscale
-    gray = image.convert("L")
 
-    # Increase contrast
-    enhancer = ImageEnhance.Contrast(gray)
-    enhanced = enhancer.enhance(2.0)
-
-    # Apply sharpening
-    sharpened = enhanced.filter(ImageFilter.SHARPEN)
+def extract_region(image: Image.Image, region: tuple) -> Image.Image:
+    """Extract a specific region from the card image"""
+    return image.crop(region)
 
-    # For number regions, apply additional processing
-    if region_type in ["cost", "score"]:
-        # Increase size for better digit recognition
-        width, height = sharpened.size
-        sharpened = sharpened.resize((width * 3, height * 3), Image.Resampling.LANCZOS)
 
-        # Binarize for cleaner digits
-        threshold = 128
-        sharpened = sharpened.point(lambda x: 255 if x > threshold else 0)
+# OCR calls made in this process (including ones answered by the cache)
+_ocr_calls = 0
 
-    return sharpened
 
+def cached_ocr(image_hash: Optional[str], region, config: str, lang: Optional[str], run):
+    """
+    Run an OCR call through the persistent cache.
 
-def extract_region(image: Image.Image, region: tuple) -> Image.Image:
-    """Extract a specific region from the card image"""
-    return image.crop(region)
+    Args:
+        image_hash: Content hash of the card image (None disables caching)
+        region: Crop the call reads (a CARD_REGIONS tuple or a label like "full")
+        config: Tesseract config string
+        lang: OCR language
+        run: Zero-argument function doing the actual preprocessing and OCR
+    """
+    global _ocr_calls
+    _ocr_calls += 1
+    cache = get_ocr_cache()
+    if cache is None or image_hash is None:
+        return run()
+    key = (image_hash, region, PREPROCESS_VERSION, get_ocr_backend().name, config, lang)
+    return cache.get_or_compute(key, run)
+
+
+def ocr_region_words(
+    image: Image.Image,
+    region: tuple,
+    region_type: str,
+    config: str,
+    scale: int = 1,
+    lang: Optional[str] = None,
+    image_hash: Optional[str] = None,
+    prepared: Optional[PreprocessedCard] = None
+) -> list[dict]:
+    """
+    OCR one preprocessed card region.
 
+    Args:
+        region: (left, top, right, bottom) in card coordinates
+        region_type: Preprocessing for the crop (see PreprocessedCard.region)
+        config: Tesseract config string
+        scale: Extra upscale applied after preprocessing
 
-def detect_effect_symbol(image: Image.Image) -> str:
+    Returns:
+        Words as {"text", "conf", "box", "line"} with boxes in card coordinates
     """
-    Detect the effect symbol from the effect icon region.
+    def run():
+        processed = (prepared or PreprocessedCard(image)).region(region, region_type)
+        if scale > 1:
+            processed = processed.resize(
+                (processed.width * scale, processed.height * scale), Image.Resampling.LANCZOS
+            )
+        return get_ocr_backend().image_to_data(processed, config=config, lang=lang)
+
+    data = cached_ocr(image_hash, ("words", region, scale), config, lang, run)
+    factor = scale * (NUMBER_SCALE if region_type in NUMBER_REGION_TYPES else 1)
+    return words_from_data(data, factor, region[:2])
+
+
+def words_from_data(data: dict, scale: float = 1, offset: tuple = (0, 0)) -> list[dict]:
+    """Non-empty words of an image_to_data result, with boxes mapped back to card coordinates"""
+    words = []
+    for i, text in enumerate(data["text"]):
+        text = text.strip()
+        conf = float(data["conf"][i])
+        if not text or conf < 0:
+            continue
+        left, top = offset[0] + data["left"][i] / scale, offset[1] + data["top"][i] / scale
+        words.append({
+            "text": text,
+            "conf": conf,
+            "box": (left, top, left + data["width"][i] / scale, top + data["height"][i] / scale),
+            "line": (data["block_num"][i], data["par_num"][i], data["line_num"][i]),
+        })
+    return words
+
+
+def symbol_from_text(text: str) -> str:
+    """
+    Map OCR output of the effect icon to an effect symbol.
 
     Symbols:
     - Lightning bolt (zigzag): INSTANT effect (triggered on tame)
     - Infinity symbol (horizontal 8): PERMANENT effect (always active)
     - Hourglass: SCORING effect (calculated at end)
     """
-    # Get the effect icon region
-    icon_region = CARD_REGIONS["effect_icon"]
-    icon_img = extract_region(image, icon_region)
-
-    # Preprocess for symbol detection
-    processed = preprocess_image(icon_img, "symbol")
-
-    # Try OCR to detect symbols
-    # These unicode characters might be detected
-    text = pytesseract.image_to_string(processed, config="--psm 10 --oem 3")
     text = text.strip().lower()
 
     # Check for known symbols or their OCR representations
@@ -201,42 +373,6 @@ def detect_effect_symbol(image: Image.Image) -> str:
     return EffectSymbol.NONE.value
 
 
-def extract_number(image: Image.Image, region: tuple) -> Optional[int]:
-    """Extract a number from a specific region of the card"""
-    try:
-        region_img = extract_region(image, region)
-        processed = preprocess_image(region_img, "number")
-
-        # Use PSM 10 for single character, PSM 7 for single line
-        config = "--psm 10 --oem 3 -c tessedit_char_whitelist=0123456789"
-        text = pytesseract.image_to_string(processed, config=config)
-
-        # Extract digits
-        digits = re.findall(r"\d+", text)
-        if digits:
-            return int(digits[0])
-        return None
-    except Exception as e:
-        logging.warning(f"Failed to extract number: {e}")
-        return None
-
-
-def extract_text(image: Image.Image, region: tuple, lang: str = "eng") -> str:
-    """Extract text from a specific region of the card"""
-    try:
-        region_img = extract_region(image, region)
-        processed = preprocess_image(region_img, "text")
-
-        # PSM 6 for uniform block of text
-        config = f"--psm 6 --oem 3 -l {lang}"
-        text = pytesseract.image_to_string(processed, config=config)
-
-        return text.strip()
-    except Exception as e:
-        logging.warning(f"Failed to extract text: {e}")
-        return ""
-
-
 def detect_element_from_color(image: Image.Image) -> Optional[str]:
     """
     Detect card element based on dominant colors.
@@ -247,18 +383,22 @@ def detect_element_from_color(image: Image.Image) -> Optional[str]:
     - Green/Brown: EARTH
     - Purple/Pink: WIND
     - Gold/Yellow: DRAGON
+
+    Uses the color centroids fitted by element_colors.py when available and
+    falls back to fixed RGB thresholds otherwise.
     """
-    # Get corner region for element detection (usually has element icon)
-    corner = image.crop((170, 5, 195, 30))
+    classifier = get_element_classifier()
+    if classifier is not None:
+        element, _confidence = classifier.classify(image)
+        return element
 
-    # Calculate average color
-    pixels = list(corner.getdata())
-    if not pixels:
+    # Get corner region for element detection (usually has element icon)
+    corner = np.asarray(image.crop((170, 5, 195, 30)), dtype=np.float64)
+    if corner.size == 0:
         return None
 
-    r_avg = sum(p[0] for p in pixels) / len(pixels)
-    g_avg = sum(p[1] for p in pixels) / len(pixels)
-    b_avg = sum(p[2] for p in pixels) / len(pixels)
+    # Calculate average color
+    r_avg, g_avg, b_avg = corner.reshape(-1, corner.shape[-1])[:, :3].mean(axis=0)
 
     # Determine element based on color
     if r_avg > 180 and g_avg < 100 and b_avg < 100:
@@ -275,6 +415,170 @@ def detect_element_from_color(image: Image.Image) -> Optional[str]:
     return None
 
 
+# ============================================
+# Visual Analysis (no OCR)
+# ============================================
+
+def visual_fields(image: Image.Image, fields: Iterable[str] = DEFAULT_FIELDS) -> VisualFields:
+    """Element, cost/score badges and effect symbol of one card image (as far as fields asks)"""
+    visual = VisualFields()
+    if "element" in fields:
+        visual.element = detect_element_from_color(image)
+
+    digits = get_digit_classifier()
+    if digits is not None:
+        for field_name in ("cost", "score"):
+            if field_name not in fields:
+                continue
+            value, margin = digits.classify(image, field_name)
+            if value is not None:
+                setattr(visual, field_name, value)
+                visual.number_scores[field_name] = round(margin, 3)
+
+    detector = get_symbol_detector()
+    if detector is not None and "effect_type" in fields:
+        visual.effect_type, visual.effect_symbol_score = detector.detect(image)
+    return visual
+
+
+def visual_fields_batch(rgb: np.ndarray) -> list[VisualFields]:
+    """
+    `visual_fields` for an (N, H, W, 3) uint8 stack of same-size card images.
+
+    Region crops, color histograms, badge features and symbol correlation each
+    run as one array operation over the whole stack.
+    """
+    visuals = [VisualFields() for _ in range(len(rgb))]
+
+    classifier = get_element_classifier()
+    if classifier is not None:
+        elements = [element for element, _confidence in classifier.classify_batch(rgb)]
+    else:
+        elements = [detect_element_from_color(Image.fromarray(pixels)) for pixels in rgb]
+    for visual, element in zip(visuals, elements):
+        visual.element = element
+
+    digits = get_digit_classifier()
+    if digits is not None:
+        for field_name in ("cost", "score"):
+            for visual, (value, margin) in zip(visuals, digits.classify_batch(rgb, field_name)):
+                if value is not None:
+                    setattr(visual, field_name, value)
+                    visual.number_scores[field_name] = round(margin, 3)
+
+    detector = get_symbol_detector()
+    if detector is not None:
+        for visual, (symbol, score) in zip(visuals, detector.detect_batch(rgb)):
+            visual.effect_type, visual.effect_symbol_score = symbol, score
+    return visuals
+
+
+def batch_visual_fields(image_files: list[Path]) -> dict[int, VisualFields]:
+    """
+    Visual fields of every image that shares its size with another image.
+
+    Same-size images are decoded into (N, H, W, 3) arrays of up to BATCH_SIZE
+    cards and analyzed together. Images of a size no other image has are left
+    out and analyzed on their own by analyze_card_image.
+
+    Returns:
+        {index into image_files: VisualFields}
+    """
+    by_size: dict[tuple, list[int]] = {}
+    for i, image_path in enumerate(image_files):
+        try:
+            with Image.open(image_path) as image:  # header only, no decode
+                by_size.setdefault(image.size, []).append(i)
+        except Exception:
+            continue  # reported when the card itself is analyzed
+
+    visuals = {}
+    for size, indices in by_size.items():
+        if len(indices) < 2:
+            continue
+        for start in range(0, len(indices), BATCH_SIZE):
+            chunk = indices[start:start + BATCH_SIZE]
+            rgb = np.empty((len(chunk), size[1], size[0], 3), dtype=np.uint8)
+            for row, i in enumerate(chunk):
+                with Image.open(image_files[i]) as image:
+                    rgb[row] = np.asarray(image.convert("RGB"))
+            visuals.update(zip(chunk, visual_fields_batch(rgb)))
+    return visuals
+
+
+# ============================================
+# Single-Pass Layout OCR
+# ============================================
+
+def ocr_layout(
+    image: Image.Image,
+    image_hash: Optional[str] = None,
+    prepared: Optional[PreprocessedCard] = None
+) -> list[dict]:
+    """
+    Run one tesseract layout pass over the whole card.
+
+    Returns:
+        Words as {"text", "conf", "box", "line"} with boxes in card coordinates
+    """
+    config = "--psm 11 --oem 3"
+
+    def run():
+        processed = (prepared or PreprocessedCard(image)).region(None, "general")
+        processed = processed.resize(
+            (processed.width * LAYOUT_SCALE, processed.height * LAYOUT_SCALE),
+            Image.Resampling.LANCZOS
+        )
+        return get_ocr_backend().image_to_data(processed, config=config)
+
+    data = cached_ocr(image_hash, ("layout", LAYOUT_SCALE), config, None, run)
+    return words_from_data(data, LAYOUT_SCALE)
+
+
+def assign_words_to_regions(words: list[dict]) -> dict[str, list[dict]]:
+    """Group layout words by the CARD_REGIONS entry containing their center"""
+    regions = {name: [] for name in CARD_REGIONS}
+    for word in words:
+        x = (word["box"][0] + word["box"][2]) / 2
+        y = (word["box"][1] + word["box"][3]) / 2
+        for name, (left, top, right, bottom) in CARD_REGIONS.items():
+            if left <= x < right and top <= y < bottom:
+                regions[name].append(word)
+                break
+    return regions
+
+
+def layout_text(words: list[dict]) -> str:
+    """Rebuild plain text (one line per tesseract line) from layout words"""
+    lines = {}
+    for word in words:
+        lines.setdefault(word["line"], []).append(word["text"])
+    return "\n".join(" ".join(line) for _key, line in sorted(lines.items()))
+
+
+def number_from_words(words: list[dict]) -> tuple[Optional[int], float]:
+    """First number among a region's words, with the lowest confidence of the words used"""
+    digit_words = [w for w in words if re.search(r"\d", w["text"])]
+    digits = re.findall(r"\d+", " ".join(w["text"] for w in digit_words))
+    if not digits:
+        return None, 0.0
+    return int(digits[0]), min(w["conf"] for w in digit_words)
+
+
+def text_from_words(words: list[dict]) -> tuple[str, float]:
+    """Joined text of a region's words, with their mean confidence"""
+    if not words:
+        return "", 0.0
+    return layout_text(words), sum(w["conf"] for w in words) / len(words)
+
+
+def symbol_from_words(words: list[dict]) -> tuple[Optional[str], float]:
+    """Effect symbol read from the icon region's words (None if unrecognized)"""
+    text, conf = text_from_words(words)
+    symbol = symbol_from_text(text)
+    return (None if symbol == EffectSymbol.NONE.value else symbol), conf
+
+
 # ============================================
 # Card Name Extraction from Filename
 # ============================================
@@ -316,13 +620,24 @@ def extract_name_from_filename(filename: str) -> str:
 # Main Analysis Functions
 # ============================================
 
-def analyze_card_image(image_path: Path, verbose: bool = False) -> ExtractedCard:
+def analyze_card_image(
+    image_path: Path,
+    verbose: bool = False,
+    single_pass: bool = False,
+    visual: Optional[VisualFields] = None,
+    fields: Optional[Iterable[str]] = None
+) -> ExtractedCard:
     """
     Analyze a single card image and extract all information.
 
     Args:
         image_path: Path to the card image
         verbose: Whether to print detailed progress
+        single_pass: Read every field from one full-card layout pass and only
+            re-read missing or low-confidence fields region by region
+        visual: Fields already read from a batch (see batch_visual_fields);
+            computed from this image when None
+        fields: Fields to extract (default DEFAULT_FIELDS); verbose adds raw_text
 
     Returns:
         ExtractedCard with extracted information
@@ -336,41 +651,41 @@ def analyze_card_image(image_path: Path, verbose: bool = False) -> ExtractedCard
         if image.mode != "RGB":
             image = image.convert("RGB")
 
+        # Decoded once; OCR regions share its preprocessed planes
+        prepared = PreprocessedCard(image)
+
+        # Content hash keys the OCR cache
+        cache = get_ocr_cache()
+        image_hash = file_hash(image_path) if cache else None
+        hits_before = cache.hits if cache else 0
+        calls_before = _ocr_calls
+
         # Extract name from filename (most reliable method)
         card.name = extract_name_from_filename(image_path.name)
 
         if verbose:
             logging.info(f"Processing: {card.name}")
 
-        # Extract cost (top-left number)
-        card.cost = extract_number(image, CARD_REGIONS["cost"])
-
-        # Extract score (bottom-right number)
-        card.score = extract_number(image, CARD_REGIONS["score"])
-
-        # Detect element from colors
-        card.element = detect_element_from_color(image)
-
-        # Detect effect type from symbol
-        card.effect_type = detect_effect_symbol(image)
+        fields = set(fields or DEFAULT_FIELDS)
+        if verbose:
+            fields.add("raw_text")
 
-        # Extract effect text
-        effect_text = extract_text(image, CARD_REGIONS["effect_text"])
-        card.effect_description = effect_text
+        # Element, badges and effect symbol from the art, then OCR where needed
+        visual = visual or visual_fields(image, fields)
+        card.number_scores = dict(visual.number_scores)
+        extract_fields(card, image, fields, visual, image_hash, prepared, single_pass)
 
-        # Get full card text for reference
-        full_text = pytesseract.image_to_string(image, config="--psm 6 --oem 3")
-        card.raw_text = full_text.strip()
+        card.ocr_calls = _ocr_calls - calls_before
+        card.ocr_cache_hits = (cache.hits - hits_before) if cache else 0
+        card.preprocess_ms = prepared.seconds * 1000
+        if verbose:
+            logging.info(f"  {card.ocr_calls} OCR calls ({card.ocr_cache_hits} cached), "
+                         f"preprocessing {card.preprocess_ms:.1f} ms")
 
-        # Calculate confidence based on successful extractions
-        fields_extracted = sum([
-            bool(card.name),
-            card.cost is not None,
-            card.score is not None,
-            bool(card.element),
-            bool(card.effect_description)
-        ])
-        card.confidence = fields_extracted / 5.0
+        # Calculate confidence based on successful extractions of the requested fields
+        scored = [f for f in ("cost", "score", "element", "effect_description") if f in fields]
+        fields_extracted = bool(card.name) + sum(getattr(card, f) not in (None, "") for f in scored)
+        card.confidence = fields_extracted / (1 + len(scored))
 
     except Exception as e:
         card.errors.append(str(e))
@@ -379,10 +694,308 @@ def analyze_card_image(image_path: Path, verbose: bool = False) -> ExtractedCard
     return card
 
 
+# ============================================
+# Extraction Plan
+# ============================================
+
+def escalate(tiers: list[tuple[str, Callable[[], list[dict]]]], read: Callable) -> tuple:
+    """
+    Run extraction tiers in order until one is confident.
+
+    Args:
+        tiers: (tier name, zero-argument function returning OCR words), cheapest first
+        read: Maps words to (value, confidence 0-100); None or "" means nothing was read
+
+    Returns:
+        (value, tier) of the first result at LOW_CONFIDENCE or above, else of
+        the most confident result; (None, None) when no tier read anything
+    """
+    best_value, best_tier, best_conf = None, None, -1.0
+    for tier, words in tiers:
+        value, conf = read(words())
+        if value is None or value == "":
+            continue
+        if conf >= LOW_CONFIDENCE:
+            return value, tier
+        if conf > best_conf:
+            best_value, best_tier, best_conf = value, tier, conf
+    return best_value, best_tier
+
+
+def extract_fields(
+    card: ExtractedCard,
+    image: Image.Image,
+    fields: Iterable[str],
+    visual: VisualFields,
+    image_hash: Optional[str] = None,
+    prepared: Optional[PreprocessedCard] = None,
+    single_pass: bool = False
+) -> None:
+    """
+    Fill the requested fields of a card, cheapest extractor first.
+
+    Element, cost/score and the effect symbol come from the art (tiers
+    "color" and "template"). Whatever those miss, and the effect text, goes
+    through OCR tiers: the shared layout pass in single-pass mode ("layout"),
+    then region OCR with heavier settings (NUMBER_TIERS, TEXT_TIERS,
+    SYMBOL_TIERS). The tier behind each field is kept in card.field_tiers.
+    """
+    layout = {}
+
+    def layout_words(region_name: Optional[str] = None) -> list[dict]:
+        """Words of the single-pass layout OCR, run on first use"""
+        if not layout:
+            layout["words"] = ocr_layout(image, image_hash, prepared)
+            layout["regions"] = assign_words_to_regions(layout["words"])
+        return layout["regions"][region_name] if region_name else layout["words"]
+
+    def ocr_tiers(region_name: str, region_type: str, table: list, lang: Optional[str] = None) -> list:
+        tiers = [("layout", lambda: layout_words(region_name))] if single_pass else []
+        for tier, config, scale in table:
+            tiers.append((tier, lambda config=config, scale=scale: ocr_region_words(
+                image, CARD_REGIONS[region_name], region_type, config, scale, lang, image_hash, prepared
+            )))
+        return tiers
+
+    def record(field_name: str, value, tier: Optional[str]) -> None:
+        setattr(card, field_name, value)
+        if tier is not None and value not in (None, ""):
+            card.field_tiers[field_name] = tier
+
+    if "element" in fields:
+        record("element", visual.element, "color")
+
+    for field_name in ("cost", "score"):
+        if field_name in fields:
+            value, tier = getattr(visual, field_name), "template"
+            if value is None:
+                value, tier = escalate(ocr_tiers(field_name, "number", NUMBER_TIERS), number_from_words)
+            record(field_name, value, tier)
+
+    if "effect_type" in fields:
+        if visual.effect_type is not None:
+            card.effect_symbol_score = visual.effect_symbol_score
+            record("effect_type", visual.effect_type, "template")
+        else:
+            symbol, tier = escalate(ocr_tiers("effect_icon", "symbol", SYMBOL_TIERS), symbol_from_words)
+            record("effect_type", symbol or EffectSymbol.NONE.value, tier)
+
+    if "effect_description" in fields:
+        text, tier = escalate(ocr_tiers("effect_text", "text", TEXT_TIERS, lang="eng"), text_from_words)
+        record("effect_description", text or "", tier)
+
+    if "raw_text" in fields:
+        if single_pass:
+            record("raw_text", layout_text(layout_words()), "layout")
+        else:
+            # Full card text for reference
+            full_config = "--psm 6 --oem 3"
+            full_text = cached_ocr(
+                image_hash, "full", full_config, None,
+                lambda: get_ocr_backend().image_to_string(image, config=full_config)
+            )
+            record("raw_text", full_text.strip(), "ocr")
+
+
+def card_effects(card: ExtractedCard) -> list[dict]:
+    """Effects list of the output format (empty when no effect text or symbol was found)"""
+    if not card.effect_description and card.effect_type == EffectSymbol.NONE.value:
+        return []
+    return [{"type": card.effect_type, "description": card.effect_description}]
+
+
+def card_to_result(card: ExtractedCard, verbose: bool = False) -> dict:
+    """Convert an ExtractedCard to the output dictionary format"""
+    result = {
+        "name": card.name,
+        "cost": card.cost,
+        "score": card.score,
+        "element": card.element,
+        "effects": card_effects(card),
+        "confidence": card.confidence,
+        "tiers": card.field_tiers or None,
+        "filename": card.filename,
+        "raw_text": card.raw_text if verbose or card.raw_text else None
+    }
+
+    # Remove None values
+    return {k: v for k, v in result.items() if v is not None}
+
+
+def _init_worker(backend_name: str, cache_settings: Optional[dict]) -> None:
+    """Worker process setup (spawned workers do not inherit the tesseract path, OCR engine or cache)"""
+    setup_tesseract()
+    get_ocr_backend(backend_name)
+    if cache_settings:
+        configure_ocr_cache(**cache_settings)
+    else:
+        configure_ocr_cache(enabled=False)
+
+
+def analyze_images(
+    image_files: list[Path],
+    verbose: bool = False,
+    jobs: int = 1,
+    single_pass: bool = False,
+    batch: bool = False,
+    fields: Optional[Iterable[str]] = None
+) -> list[ExtractedCard]:
+    """
+    Analyze images, optionally across a process pool.
+
+    Args:
+        image_files: Card images to analyze
+        verbose: Whether to print detailed progress
+        jobs: Number of worker processes (1 = analyze in this process)
+        single_pass: Passed to analyze_card_image
+        batch: Read element, badges and effect symbols of same-size images
+            as stacked arrays before the per-card OCR (see batch_visual_fields)
+        fields: Passed to analyze_card_image
+
+    Returns:
+        ExtractedCard list in the same order as image_files
+    """
+    cards: list[Optional[ExtractedCard]] = [None] * len(image_files)
+    for i, card in iter_analyzed_cards(image_files, verbose, jobs, single_pass, batch, fields):
+        cards[i] = card
+    return cards
+
+
+def iter_analyzed_cards(
+    image_files: list[Path],
+    verbose: bool = False,
+    jobs: int = 1,
+    single_pass: bool = False,
+    batch: bool = False,
+    fields: Optional[Iterable[str]] = None
+) -> Iterator[tuple[int, ExtractedCard]]:
+    """
+    Analyze images and yield (index into image_files, card) as each finishes.
+
+    Takes the same arguments as analyze_images. Cards are not kept after
+    they are yielded; the run summary is logged once all are done.
+    """
+    total = len(image_files)
+    if not total:
+        return
+    start = time.perf_counter()
+
+    def progress(done: int, image_path: Path) -> None:
+        if verbose or jobs > 1:
+            rate = done / (time.perf_counter() - start)
+            print(f"[{done}/{total}] {image_path.name} ({rate:.1f} cards/s)")
+
+    visuals = {}
+    if batch:
+        visuals = batch_visual_fields(image_files)
+        logging.info(f"Batched visual analysis: {len(visuals)} of {total} cards "
+                     f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    ocr_calls = cache_hits = 0
+    preprocess_ms = 0.0
+    tiers: dict[str, Counter] = {}
+
+    def finished(card: ExtractedCard) -> None:
+        nonlocal ocr_calls, cache_hits, preprocess_ms
+        ocr_calls += card.ocr_calls
+        cache_hits += card.ocr_cache_hits
+        preprocess_ms += card.preprocess_ms
+        for field_name, tier in card.field_tiers.items():
+            tiers.setdefault(field_name, Counter())[tier] += 1
+
+    if jobs <= 1:
+        for i, image_path in enumerate(image_files):
+            card = analyze_card_image(image_path, verbose, single_pass, visuals.get(i), fields)
+            finished(card)
+            progress(i + 1, image_path)
+            yield i, card
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(get_ocr_backend().name, ocr_cache_settings())
+        ) as pool:
+            futures = {
+                pool.submit(analyze_card_image, image_path, verbose, single_pass, visuals.get(i), fields): i
+                for i, image_path in enumerate(image_files)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures.pop(future)
+                try:
+                    card = future.result()
+                except Exception as e:
+                    # A crashed worker loses the card, not the whole run
+                    logging.error(f"Error analyzing {image_files[i]}: {e}")
+                    card = ExtractedCard(filename=image_files[i].name, errors=[str(e)])
+                finished(card)
+                progress(done, image_files[i])
+                yield i, card
+
+    elapsed = time.perf_counter() - start
+    logging.info(f"Analyzed {total} cards in {elapsed:.1f}s "
+                 f"({total / elapsed:.2f} cards/s, {jobs} job{'s' if jobs > 1 else ''}, "
+                 f"{ocr_calls / total:.1f} OCR calls/card, "
+                 f"{preprocess_ms / total:.1f} ms preprocessing/card, {get_ocr_backend().name})")
+    if tiers:
+        logging.info("Field tiers: " + "; ".join(
+            f"{field_name} " + ", ".join(f"{tier} {count}" for tier, count in counts.most_common())
+            for field_name, counts in tiers.items()
+        ))
+    cache = get_ocr_cache()
+    if cache:
+        cache.evict()  # workers only check the size limit every few hundred writes
+        logging.info(f"OCR cache: {cache_hits} of {ocr_calls} calls served from cache "
+                     f"({cache_hits / ocr_calls if ocr_calls else 0:.0%})")
+
+
+def compare_backends(
+    image_files: list[Path],
+    verbose: bool = False,
+    jobs: int = 1,
+    single_pass: bool = False,
+    batch: bool = False,
+    fields: Optional[Iterable[str]] = None
+) -> dict:
+    """
+    Analyze the same images with every available OCR backend.
+
+    The OCR cache is turned off (here and in worker processes) so that every
+    backend really runs OCR on every region instead of replaying earlier runs.
+
+    Returns:
+        {backend name: {"seconds", "cards_per_second", "differences"}} where
+        differences counts fields that disagree with the pytesseract results
+    """
+    compared = ("cost", "score", "effect_type", "effect_description")
+    configure_ocr_cache(enabled=False)
+    runs = {}
+    for name in available_backends():
+        get_ocr_backend(name)
+        start = time.perf_counter()
+        cards = analyze_images(image_files, verbose, jobs, single_pass, batch, fields)
+        runs[name] = (time.perf_counter() - start, cards)
+
+    baseline = runs["pytesseract"][1]
+    report = {}
+    for name, (seconds, cards) in runs.items():
+        report[name] = {
+            "seconds": round(seconds, 2),
+            "cards_per_second": round(len(cards) / seconds, 2),
+            "differences": sum(
+                getattr(card, field_name) != getattr(base, field_name)
+                for card, base in zip(cards, baseline)
+                for field_name in compared
+            ),
+        }
+    return report
+
+
 def analyze_all_cards(
     input_dir: Path,
     output_file: Path,
-    verbose: bool = False
+    verbose: bool = False,
+    jobs: int = 1,
+    single_pass: bool = False,
+    batch: bool = False,
+    fields: Optional[Iterable[str]] = None
 ) -> dict:
     """
     Analyze all card images in a directory.
@@ -391,6 +1004,10 @@ def analyze_all_cards(
         input_dir: Directory containing card images
         output_file: Path to save JSON output
         verbose: Whether to print detailed progress
+        jobs: Number of worker processes; output order does not depend on it
+        single_pass: Use one layout OCR pass per card (see analyze_card_image)
+        batch: Analyze the art of same-size images as stacked arrays (see analyze_images)
+        fields: Fields to extract (default DEFAULT_FIELDS)
 
     Returns:
         Dictionary of extracted card data
@@ -398,7 +1015,7 @@ def analyze_all_cards(
     results = {}
 
     # Get all webp images
-    image_files = sorted(input_dir.glob("*.webp"))
+    image_files = get_asset_index().files_in(input_dir, ".webp")
 
     if not image_files:
         logging.warning(f"No .webp files found in {input_dir}")
@@ -406,33 +1023,11 @@ def analyze_all_cards(
 
     logging.info(f"Found {len(image_files)} card images to analyze")
 
-    # Process each image
-    for i, image_path in enumerate(image_files, 1):
-        if verbose:
-            print(f"[{i}/{len(image_files)}] Analyzing {image_path.name}...")
-
-        card = analyze_card_image(image_path, verbose)
-
+    # Results are collected in file order regardless of completion order
+    for card in analyze_images(image_files, verbose, jobs, single_pass, batch, fields):
         # Generate card ID from name
         card_id = generate_card_id(card.name, card.element)
-
-        # Convert to dictionary format
-        results[card_id] = {
-            "name": card.name,
-            "cost": card.cost,
-            "score": card.score,
-            "element": card.element,
-            "effects": [{
-                "type": card.effect_type,
-                "description": card.effect_description
-            }] if card.effect_description else [],
-            "confidence": card.confidence,
-            "filename": card.filename,
-            "raw_text": card.raw_text if verbose else None
-        }
-
-        # Remove None values
-        results[card_id] = {k: v for k, v in results[card_id].items() if v is not None}
+        results[card_id] = card_to_result(card, verbose)
 
     # Save to JSON
     with open(output_file, "w", encoding="utf-8") as f:
@@ -458,31 +1053,216 @@ def generate_card_id(name: str, element: Optional[str]) -> str:
 
     prefix = element_prefixes.get(element, "U")  # U for Unknown
 
-    # Create a simple hash from name
-    name_hash = abs(hash(name.lower())) % 1000
+    # Create a simple hash from name (stable across runs, unlike hash())
+    name_hash = zlib.crc32(name.lower().encode("utf-8")) % 1000
 
     return f"{prefix}{name_hash:03d}"
 
 
+# ============================================
+# Streaming Output
+# ============================================
+
+def image_content_hash(image_path: Path) -> str:
+    """SHA-256 of an image, read from the file itself so that resume never trusts a stale cache"""
+    return file_hash(image_path)
+
+
+def read_stream(stream_file: Path) -> Iterator[tuple[int, dict]]:
+    """
+    Records of an NDJSON result stream with their byte offsets.
+
+    A line cut off by a crash mid-write is skipped.
+    """
+    if not stream_file.exists():
+        return
+    with open(stream_file, "rb") as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            try:
+                yield offset, json.loads(line)
+            except json.JSONDecodeError:
+                logging.warning(f"Skipping incomplete record at byte {offset} of {stream_file}")
+
+
+def trim_stream(stream_file: Path) -> None:
+    """Drop a last line cut off by a crash, so appended records start on a fresh line"""
+    if not stream_file.exists():
+        return
+    with open(stream_file, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                position += newline + 1
+                break
+        if position < end:
+            logging.warning(f"Dropping incomplete last record of {stream_file}")
+            f.truncate(position)
+
+
+def results_summary(results: Iterable[dict]) -> dict:
+    """Card count, average confidence and cards per element of output results"""
+    total, confidence, elements = 0, 0.0, Counter()
+    for result in results:
+        total += 1
+        confidence += result.get("confidence", 0)
+        elements[result.get("element", "Unknown")] += 1
+    return {
+        "total": total,
+        "average_confidence": confidence / total if total else 0.0,
+        "elements": dict(elements),
+    }
+
+
+def compact_stream(stream_file: Path, output_file: Path, images: list[tuple[str, str]]) -> dict:
+    """
+    Write the final JSON (same shape as analyze_all_cards) from a result stream.
+
+    Only records of the given (sha256, filename) images are kept, in that
+    order; the latest record wins for an image analyzed more than once, and
+    for card ids seen twice. Files with identical bytes but different names
+    are separate images, as they are for analyze_all_cards. Records are read back one at a time by offset, so memory does
+    not grow with the number of cards.
+
+    Returns:
+        results_summary of the written results
+    """
+    offsets = {}
+    for offset, record in read_stream(stream_file):
+        offsets[record["sha256"], record["filename"]] = (offset, record["id"])
+
+    by_id = {}
+    for image in images:
+        if image in offsets:
+            offset, card_id = offsets[image]
+            by_id[card_id] = offset
+
+    temp_file = output_file.with_name(output_file.name + ".tmp")
+
+    def results() -> Iterator[dict]:
+        with open(stream_file, "rb") as stream, open(temp_file, "w", encoding="utf-8") as out:
+            out.write("{")
+            for n, (card_id, offset) in enumerate(by_id.items()):
+                stream.seek(offset)
+                result = json.loads(stream.readline())["result"]
+                body = json.dumps(result, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+                out.write(("," if n else "") + f"\n  {json.dumps(card_id, ensure_ascii=False)}: {body}")
+                yield result
+            out.write("\n}" if by_id else "}")
+
+    summary = results_summary(results())
+    os.replace(temp_file, output_file)
+    logging.info(f"Compacted {summary['total']} results from {stream_file} into {output_file}")
+    return summary
+
+
+def analyze_all_cards_streaming(
+    input_dir: Path,
+    output_file: Path,
+    stream_file: Path,
+    verbose: bool = False,
+    jobs: int = 1,
+    single_pass: bool = False,
+    batch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    resume: bool = False
+) -> dict:
+    """
+    Analyze all card images, appending each result to an NDJSON stream as it
+    finishes, then compact the stream into output_file.
+
+    Each line is {"sha256", "filename", "id", "result"}. With resume, images
+    whose content hash and filename already have an error-free record are
+    skipped, so an interrupted run picks up where it stopped.
+
+    Returns:
+        results_summary of the compacted output
+    """
+    image_files = get_asset_index().files_in(input_dir, ".webp")
+    if not image_files:
+        logging.warning(f"No .webp files found in {input_dir}")
+        return results_summary([])
+    images = [(image_content_hash(image_path), image_path.name) for image_path in image_files]
+
+    done = set()
+    if resume:
+        trim_stream(stream_file)
+        done = {
+            (record["sha256"], record["filename"])
+            for _offset, record in read_stream(stream_file) if not record.get("errors")
+        }
+    elif stream_file.exists():
+        stream_file.unlink()
+    pending = [i for i, image in enumerate(images) if image not in done]
+    logging.info(f"Found {len(image_files)} card images, {len(image_files) - len(pending)} already in {stream_file}")
+
+    with open(stream_file, "a", encoding="utf-8") as stream:
+        pending_files = [image_files[i] for i in pending]
+        for j, card in iter_analyzed_cards(pending_files, verbose, jobs, single_pass, batch, fields):
+            record = {
+                "sha256": images[pending[j]][0],
+                "filename": card.filename,
+                "id": generate_card_id(card.name, card.element),
+                "result": card_to_result(card, verbose),
+            }
+            if card.errors:
+                record["errors"] = card.errors
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stream.flush()
+
+    return compact_stream(stream_file, output_file, images)
+
+
 # ============================================
 # Alternative: Use Existing Data + Image Verification
 # ============================================
 
+def build_reference_index(cards: dict, reference_dir: Path) -> PerceptualIndex:
+    """Perceptual hashes of the known card images, keyed by card id"""
+    images = {
+        card_id: reference_dir / card["imageUrl"]
+        for card_id, card in cards.items()
+        if card.get("imageUrl") and get_asset_index().exists(reference_dir / card["imageUrl"])
+    }
+    index = PerceptualIndex.from_images(images)
+    logging.info(f"Perceptual index: {len(index.hashes)} reference images from {reference_dir}")
+    return index
+
+
 def verify_cards_with_existing_data(
     input_dir: Path,
     existing_data_path: Path,
     output_file: Path,
-    verbose: bool = False
+    verbose: bool = False,
+    reference_dir: Optional[Path] = None,
+    max_distance: int = DEFAULT_MAX_DISTANCE
 ) -> dict:
     """
     Verify card images against existing TypeScript card data.
     This is more reliable than pure OCR extraction.
 
+    Images are matched by filename first, then by perceptual hash against the
+    known card art (catches renamed, recompressed and re-exported images),
+    then by a fuzzy filename match against the English and Chinese names
+    (catches "Mudslime" for "Mud Slime" and small typos). OCR is only used
+    for images that match none of these ways; their results list the
+    closest card names for review.
+
     Args:
         input_dir: Directory containing card images
         existing_data_path: Path to existing card data (JSON export)
         output_file: Path to save verification results
         verbose: Whether to print detailed progress
+        reference_dir: Directory holding the known cards' imageUrl files (default: input_dir)
+        max_distance: Largest pHash Hamming distance accepted as the same card
 
     Returns:
         Dictionary with verification results
@@ -492,43 +1272,91 @@ def verify_cards_with_existing_data(
     if existing_data_path.exists():
         with open(existing_data_path, "r", encoding="utf-8") as f:
             existing_data = json.load(f)
+    # Accept both a flat id -> card map and the cards-database.json layout
+    if isinstance(existing_data.get("cards"), dict):
+        existing_data = existing_data["cards"]
+
+    name_index = NameIndex.from_cards(existing_data)
+    reference_index = build_reference_index(existing_data, reference_dir or input_dir)
+    seen_index = PerceptualIndex()
 
     results = {}
-    image_files = sorted(input_dir.glob("*.webp"))
+    image_files = get_asset_index().files_in(input_dir, ".webp")
 
     for image_path in image_files:
         name = extract_name_from_filename(image_path.name)
+        try:
+            hashes = PerceptualIndex.hash_image(image_path)
+        except Exception as e:
+            logging.warning(f"Cannot hash {image_path.name}: {e}")
+            hashes = None
+
+        # Flag images that look like one already processed
+        duplicates = []
+        if hashes:
+            duplicates = [key for _d, key in seen_index.nearest(hashes, DUPLICATE_DISTANCE)]
+            for other in duplicates:
+                logging.warning(f"{image_path.name} looks like a near-duplicate of {other}")
+            seen_index.add(image_path.name, hashes)
 
         # Try to match with existing data
-        matched_card = None
-        for card_id, card_data in existing_data.items():
-            if card_data.get("name", "").lower() == name.lower():
-                matched_card = card_data
-                matched_card["id"] = card_id
-                break
-
-        if matched_card:
-            results[matched_card["id"]] = {
-                **matched_card,
+        matched_id, match = None, None
+        name_id, candidates = name_index.match(name)
+        name_candidates = [
+            {"id": card_id, "name": text, "score": round(score, 3)}
+            for score, card_id, text in candidates
+        ]
+        if name_id is not None and not candidates:
+            matched_id, match = name_id, {"match": "name"}
+
+        if matched_id is None and hashes:
+            hits = reference_index.nearest(hashes, max_distance)
+            if hits:
+                distance, matched_id = hits[0]
+                match = {"match": "phash", "hash_distance": distance}
+                if verbose:
+                    print(f"  {image_path.name} -> {matched_id} (pHash distance {distance})")
+
+        if matched_id is None and name_id is not None:
+            matched_id = name_id
+            match = {"match": "fuzzy_name", "name_candidates": name_candidates}
+            if verbose:
+                print(f"  {image_path.name} -> {matched_id} ({candidates[0][2]!r}, "
+                      f"name score {candidates[0][0]:.2f})")
+
+        if matched_id is not None and matched_id in results:
+            # Another image already claimed this card; keep the first and flag this one
+            logging.warning(f"{image_path.name} matches {matched_id}, already taken by {results[matched_id]['image_file']}")
+            flagged = results[matched_id].setdefault("near_duplicates", [])
+            if image_path.name not in flagged:
+                flagged.append(image_path.name)
+            continue
+        elif matched_id is not None:
+            results[matched_id] = {
+                **existing_data[matched_id],
+                "id": matched_id,
                 "image_file": image_path.name,
-                "verified": True
+                "verified": True,
+                **match
             }
         else:
             # Fallback to OCR extraction
             card = analyze_card_image(image_path, verbose)
-            card_id = generate_card_id(card.name, card.element)
-            results[card_id] = {
+            matched_id = generate_card_id(card.name, card.element)
+            results[matched_id] = {
                 "name": card.name,
                 "cost": card.cost,
                 "score": card.score,
-                "effects": [{
-                    "type": card.effect_type,
-                    "description": card.effect_description
-                }] if card.effect_description else [],
+                "effects": card_effects(card),
                 "image_file": image_path.name,
                 "verified": False,
                 "confidence": card.confidence
             }
+            if name_candidates:
+                results[matched_id]["name_candidates"] = name_candidates
+
+        if duplicates:
+            results[matched_id]["near_duplicates"] = duplicates
 
     # Save results
     with open(output_file, "w", encoding="utf-8") as f:
@@ -541,6 +1369,17 @@ def verify_cards_with_existing_data(
 # CLI Entry Point
 # ============================================
 
+def parse_fields(value: str) -> tuple[str, ...]:
+    """argparse type for --fields: comma-separated names from FIELDS"""
+    fields = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown or not fields:
+        raise argparse.ArgumentTypeError(
+            f"unknown field(s) {', '.join(unknown) or '(none given)'}; choose from {', '.join(FIELDS)}"
+        )
+    return fields
+
+
 def main():
     """Main entry point for the card analyzer"""
     parser = argparse.ArgumentParser(
@@ -568,6 +1407,87 @@ def main():
         type=str,
         help="Analyze a single card image (filename only)"
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help=f"Number of worker processes for batch analysis (default: 1, this machine has {os.cpu_count()} CPUs)"
+    )
+    parser.add_argument(
+        "--single-pass",
+        action="store_true",
+        help="One full-card layout OCR pass per card; only missing or low-confidence fields are re-read"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Stack same-size images into arrays and read element, badges and effect symbols in one pass"
+    )
+    parser.add_argument(
+        "--fields",
+        type=parse_fields,
+        default=DEFAULT_FIELDS,
+        help=f"Comma-separated fields to extract, from {', '.join(FIELDS)} "
+             f"(default: all but raw_text, which --verbose adds)"
+    )
+    parser.add_argument(
+        "--stream",
+        nargs="?",
+        const="",
+        metavar="NDJSON",
+        help="Append each card's result to an NDJSON file as it finishes and compact it into --output at the end "
+             "(default file: --output with an .ndjson suffix)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a --stream run, skipping images whose content hash is already recorded (implies --stream)"
+    )
+    parser.add_argument(
+        "--ocr-backend",
+        choices=BACKEND_NAMES,
+        default="auto",
+        help="OCR engine: in-process tesserocr or one pytesseract subprocess per call (default: auto)"
+    )
+    parser.add_argument(
+        "--compare-backends",
+        action="store_true",
+        help="Analyze the input directory with every available OCR backend and report speed and disagreements"
+    )
+    parser.add_argument(
+        "--ocr-cache",
+        type=Path,
+        default=DEFAULT_CACHE,
+        help=f"OCR result cache database (default: {DEFAULT_CACHE})"
+    )
+    parser.add_argument(
+        "--ocr-cache-size",
+        type=float,
+        default=DEFAULT_MAX_MB,
+        help=f"OCR cache size limit in MB; least recently used results are evicted (default: {DEFAULT_MAX_MB})"
+    )
+    parser.add_argument(
+        "--no-ocr-cache",
+        action="store_true",
+        help="Always run OCR, neither reading nor writing the cache"
+    )
+    parser.add_argument(
+        "--verify",
+        type=Path,
+        metavar="DATABASE",
+        help="Match images against known card data (e.g. cards-database.json) instead of OCR-ing every card"
+    )
+    parser.add_argument(
+        "--reference-dir",
+        type=Path,
+        help="Directory with the known cards' imageUrl files for perceptual matching (default: --input-dir)"
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=DEFAULT_MAX_DISTANCE,
+        help=f"Largest perceptual hash distance accepted as the same card (default: {DEFAULT_MAX_DISTANCE})"
+    )
 
     args = parser.parse_args()
 
@@ -588,7 +1508,15 @@ def main():
         )
         sys.exit(1)
 
-    logging.info("Tesseract OCR configured successfully")
+    try:
+        backend = get_ocr_backend(args.ocr_backend)
+    except Exception as e:
+        logging.error(f"OCR backend '{args.ocr_backend}' unavailable: {e}")
+        sys.exit(1)
+
+    logging.info(f"Tesseract OCR configured successfully ({backend.name} backend)")
+
+    configure_ocr_cache(args.ocr_cache, args.ocr_cache_size, enabled=not args.no_ocr_cache)
 
     # Verify input directory
     if not args.input_dir.exists():
@@ -602,18 +1530,24 @@ def main():
             logging.error(f"Card image not found: {single_path}")
             sys.exit(1)
 
-        card = analyze_card_image(single_path, verbose=True)
+        card = analyze_card_image(single_path, verbose=True, single_pass=args.single_pass, fields=args.fields)
         print("\n" + "=" * 50)
         print(f"Card Analysis Results: {card.name}")
         print("=" * 50)
         print(f"  Filename: {card.filename}")
         print(f"  Name: {card.name}")
-        print(f"  Cost: {card.cost}")
-        print(f"  Score: {card.score}")
+        for field_name in ("cost", "score"):
+            margin = card.number_scores.get(field_name)
+            print(f"  {field_name.title()}: {getattr(card, field_name)}"
+                  + (f" (margin {margin:.2f})" if margin is not None else ""))
         print(f"  Element: {card.element}")
-        print(f"  Effect Type: {card.effect_type}")
+        print(f"  Effect Type: {card.effect_type}"
+              + (f" (match {card.effect_symbol_score:.2f})" if card.effect_symbol_score is not None else ""))
         print(f"  Effect: {card.effect_description}")
         print(f"  Confidence: {card.confidence:.0%}")
+        print(f"  OCR calls: {card.ocr_calls}")
+        print(f"  Preprocessing: {card.preprocess_ms:.1f} ms")
+        print(f"  Tiers: {', '.join(f'{name} {tier}' for name, tier in card.field_tiers.items())}")
         if card.errors:
             print(f"  Errors: {card.errors}")
         print("\nRaw OCR Text:")
@@ -621,30 +1555,70 @@ def main():
         print(card.raw_text)
         return
 
+    # Backend comparison
+    if args.compare_backends:
+        image_files = get_asset_index().files_in(args.input_dir, ".webp")
+        report = compare_backends(image_files, args.verbose, args.jobs, args.single_pass, args.batch, args.fields)
+        print("\n" + "=" * 50)
+        print("OCR Backend Comparison")
+        print("=" * 50)
+        for name, stats in report.items():
+            print(f"  {name}: {stats['seconds']:.1f}s, {stats['cards_per_second']:.2f} cards/s, "
+                  f"{stats['differences']} fields differ from pytesseract")
+        return
+
+    # Verification against known card data
+    if args.verify:
+        results = verify_cards_with_existing_data(
+            args.input_dir, args.verify, args.output, args.verbose,
+            reference_dir=args.reference_dir, max_distance=args.max_distance
+        )
+        by_method = {}
+        for card in results.values():
+            method = card.get("match", "ocr")
+            by_method[method] = by_method.get(method, 0) + 1
+        print("\n" + "=" * 50)
+        print("Verification Complete")
+        print("=" * 50)
+        print(f"  Total cards: {len(results)}")
+        for method, count in sorted(by_method.items()):
+            print(f"  Matched by {method}: {count}")
+        duplicates = sum(1 for card in results.values() if card.get("near_duplicates"))
+        if duplicates:
+            print(f"  Near-duplicates flagged: {duplicates}")
+        cache = get_ocr_cache()
+        if cache and cache.hits + cache.misses:
+            stats = cache.stats()
+            print(f"  OCR cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%})")
+        return
+
     # Batch analysis
     logging.info(f"Starting batch analysis of {args.input_dir}")
-    results = analyze_all_cards(args.input_dir, args.output, args.verbose)
+    if args.stream is not None or args.resume:
+        stream_file = Path(args.stream) if args.stream else args.output.with_suffix(".ndjson")
+        summary = analyze_all_cards_streaming(
+            args.input_dir, args.output, stream_file, args.verbose, args.jobs,
+            args.single_pass, args.batch, args.fields, resume=args.resume
+        )
+    else:
+        results = analyze_all_cards(
+            args.input_dir, args.output, args.verbose, args.jobs, args.single_pass, args.batch, args.fields
+        )
+        summary = results_summary(results.values())
 
     # Print summary
     print("\n" + "=" * 50)
     print("Analysis Complete")
     print("=" * 50)
-    print(f"  Total cards analyzed: {len(results)}")
+    print(f"  Total cards analyzed: {summary['total']}")
 
-    # Calculate average confidence
-    confidences = [c.get("confidence", 0) for c in results.values()]
-    if confidences:
-        avg_confidence = sum(confidences) / len(confidences)
-        print(f"  Average confidence: {avg_confidence:.0%}")
+    # Average confidence
+    if summary["total"]:
+        print(f"  Average confidence: {summary['average_confidence']:.0%}")
 
     # Count by element
-    elements = {}
-    for card in results.values():
-        elem = card.get("element", "Unknown")
-        elements[elem] = elements.get(elem, 0) + 1
-
     print("\n  Cards by element:")
-    for elem, count in sorted(elements.items()):
+    for elem, count in sorted(summary["elements"].items()):
         print(f"    {elem}: {count}")
 
     print(f"\n  Results saved to: {args.output}")
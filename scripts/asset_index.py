@@ -0,0 +1,266 @@
+"""
+Shared Asset Index for The Vale of Eternity scripts
+Scans the card art and public asset directories once and records size,
+dimensions, format and content hash for every file.
+
+The index is cached on disk. On the next run only directories whose mtime
+changed (files added, removed or renamed) are rescanned, and within those
+only files whose size or mtime changed are re-hashed. Lookups of indexed
+files touch no disk at all; a lookup that misses re-checks the directory's
+mtime, so files added after the refresh are still found. Files edited in
+place do not change their directory's mtime and are picked up by
+`refresh(full=True)`, or per file by `get(path, verify=True)`.
+
+Usage (from another script in this directory):
+    from asset_index import get_asset_index
+
+    index = get_asset_index()
+    index.exists(IMAGES_DIR / "200px-Hestia.webp")
+    index.files_in(IMAGES_DIR, ".webp")
+
+@version 1.0.0
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional
+from dataclasses import dataclass, asdict
+
+try:
+    from PIL import Image
+except ImportError:  # dimensions/format are left empty without Pillow
+    Image = None
+
+
+# ============================================
+# Configuration
+# ============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ROOTS = [
+    PROJECT_ROOT / "src" / "cards" / "base",
+    PROJECT_ROOT / "public" / "assets",
+]
+DEFAULT_CACHE = PROJECT_ROOT / "scripts" / "asset-index.json"
+INDEX_VERSION = 1
+
+
+# ============================================
+# Data Classes
+# ============================================
+
+@dataclass
+class AssetEntry:
+    """Metadata for a single file"""
+    name: str
+    size: int
+    mtime_ns: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    sha256: str = ""
+
+
+@dataclass
+class DirEntry:
+    """Cached listing of a single directory"""
+    mtime_ns: int
+    files: dict
+    subdirs: list
+
+
+# ============================================
+# Helpers
+# ============================================
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def describe_file(path: Path, stat: os.stat_result) -> AssetEntry:
+    """Read header information and hash for a file"""
+    entry = AssetEntry(name=path.name, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    if stat.st_size == 0:
+        return entry
+    if Image is not None:
+        try:
+            with Image.open(path) as image:
+                entry.width, entry.height = image.size
+                entry.format = image.format
+        except Exception:
+            pass  # not an image (or unreadable), keep size and hash only
+    entry.sha256 = file_hash(path)
+    return entry
+
+
+def _key(path: Path) -> str:
+    return Path(os.path.abspath(path)).as_posix()
+
+
+# ============================================
+# Asset Index
+# ============================================
+
+class AssetIndex:
+    """In-memory index of asset directories backed by an on-disk cache"""
+
+    def __init__(self, roots: Optional[list[Path]] = None, cache_path: Path = DEFAULT_CACHE):
+        self.roots = [Path(r) for r in (roots or DEFAULT_ROOTS)]
+        self.cache_path = cache_path
+        self.dirs: dict[str, DirEntry] = {}
+        self.dirty = False
+        self.rescanned = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Ignoring unreadable asset index {self.cache_path}: {e}")
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        for key, value in data.get("dirs", {}).items():
+            files = {name: AssetEntry(**entry) for name, entry in value["files"].items()}
+            self.dirs[key] = DirEntry(value["mtime_ns"], files, value["subdirs"])
+
+    def save(self) -> None:
+        """Write the cache if anything changed"""
+        if not self.dirty:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "dirs": {
+                key: {
+                    "mtime_ns": d.mtime_ns,
+                    "subdirs": d.subdirs,
+                    "files": {name: asdict(e) for name, e in d.files.items()},
+                }
+                for key, d in sorted(self.dirs.items())
+            },
+        }
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+    def _scan_dir(self, directory: Path, full: bool = False) -> Optional[DirEntry]:
+        """Return the listing for one directory, rescanning only if stale"""
+        key = _key(directory)
+        try:
+            dir_stat = directory.stat()
+        except FileNotFoundError:
+            if self.dirs.pop(key, None) is not None:
+                self.dirty = True
+            return None
+
+        cached = self.dirs.get(key)
+        if cached and cached.mtime_ns == dir_stat.st_mtime_ns and not full:
+            return cached
+
+        old_files = cached.files if cached else {}
+        files, subdirs = {}, []
+        with os.scandir(directory) as it:
+            for item in it:
+                if item.is_dir():
+                    subdirs.append(item.name)
+                elif item.is_file():
+                    stat = item.stat()
+                    previous = old_files.get(item.name)
+                    if previous and previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+                        files[item.name] = previous
+                    else:
+                        files[item.name] = describe_file(Path(item.path), stat)
+
+        entry = DirEntry(dir_stat.st_mtime_ns, dict(sorted(files.items())), sorted(subdirs))
+        self.dirs[key] = entry
+        self.dirty = True
+        self.rescanned += 1
+        return entry
+
+    def refresh(self, full: bool = False) -> "AssetIndex":
+        """
+        Walk every root, rescanning only stale directories.
+
+        Args:
+            full: Re-stat every file even in directories whose mtime is unchanged
+        """
+        stack = list(self.roots)
+        while stack:
+            directory = stack.pop()
+            entry = self._scan_dir(directory, full)
+            if entry:
+                stack.extend(directory / name for name in entry.subdirs)
+        self.save()
+        return self
+
+    def get(self, path: Path, verify: bool = False) -> Optional[AssetEntry]:
+        """
+        Metadata for a file, or None if it does not exist.
+
+        Args:
+            verify: Re-stat the file and re-hash it if its size or mtime changed
+        """
+        path = Path(path)
+        entry = self.dirs.get(_key(path.parent))
+        if entry is None or path.name not in entry.files:
+            # Not in the cached listing: rescan if the directory changed since
+            entry = self._scan_dir(path.parent)
+        if entry is None or path.name not in entry.files:
+            return None
+
+        cached = entry.files[path.name]
+        if not verify:
+            return cached
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            del entry.files[path.name]
+            self.dirty = True
+            return None
+        if cached.size != stat.st_size or cached.mtime_ns != stat.st_mtime_ns:
+            cached = entry.files[path.name] = describe_file(path, stat)
+            self.dirty = True
+        return cached
+
+    def exists(self, path: Path) -> bool:
+        """In-memory replacement for Path.exists() on indexed files"""
+        return self.get(path) is not None
+
+    def files_in(self, directory: Path, suffix: Optional[str] = None) -> list[Path]:
+        """Sorted files in a directory (optionally filtered by suffix), like sorted(dir.glob('*.ext'))"""
+        directory = Path(directory)
+        entry = self._scan_dir(directory)
+        if entry is None:
+            return []
+        suffix = suffix.lower() if suffix else None
+        return [
+            directory / name for name in entry.files
+            if suffix is None or name.lower().endswith(suffix)
+        ]
+
+
+_index: Optional[AssetIndex] = None
+
+
+def get_asset_index(roots: Optional[list[Path]] = None) -> AssetIndex:
+    """Process-wide index, refreshed once on first use"""
+    global _index
+    if _index is None:
+        _index = AssetIndex(roots).refresh()
+        atexit.register(_index.save)
+        logging.debug(f"Asset index ready ({_index.rescanned} directories rescanned)")
+    return _index
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Sprite Atlas Builder for The Vale of Eternity
+Packs card, stone and artifact images into a few texture sheets so the
+client can fetch a handful of files at game start instead of one per card.
+
+Card frames are keyed by card id using the imageUrl values from
+cards-database.json (generated by export-cards-json.py). Stones and
+artifacts are keyed as "stone:<name>" and "artifact:<group>/<name>".
+
+Packing uses the MaxRects algorithm with the best-short-side-fit heuristic.
+
+Usage:
+    python build-atlas.py [--database FILE] [--max-size 2048] [--padding 2]
+
+@version 1.0.0
+"""
+
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+from typing import Optional
+from dataclasses import dataclass, field
+
+try:
+    from PIL import Image
+except ImportError:
+    print("Error: Pillow not installed. Run: pip install Pillow")
+    sys.exit(1)
+
+
+# ============================================
+# Configuration
+# ============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DATABASE = PROJECT_ROOT / "scripts" / "cards-database.json"
+CARD_IMAGES_DIR = PROJECT_ROOT / "public" / "cards" / "base"
+STONES_DIR = PROJECT_ROOT / "public" / "assets" / "stones"
+ARTIFACTS_DIR = PROJECT_ROOT / "public" / "assets" / "artifacts"
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "public" / "atlas"
+
+DEFAULT_MAX_SIZE = 2048
+DEFAULT_PADDING = 2
+DEFAULT_QUALITY = 85
+
+
+# ============================================
+# Data Classes
+# ============================================
+
+@dataclass
+class Sprite:
+    """An image to pack"""
+    key: str
+    path: Path
+    width: int
+    height: int
+
+
+@dataclass
+class Placement:
+    """Where a sprite ended up"""
+    sprite: Sprite
+    sheet: int
+    x: int
+    y: int
+
+
+@dataclass
+class Rect:
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def contains(self, other: "Rect") -> bool:
+        return (
+            other.x >= self.x and other.y >= self.y
+            and other.x + other.width <= self.x + self.width
+            and other.y + other.height <= self.y + self.height
+        )
+
+    def intersects(self, other: "Rect") -> bool:
+        return not (
+            other.x >= self.x + self.width or other.x + other.width <= self.x
+            or other.y >= self.y + self.height or other.y + other.height <= self.y
+        )
+
+
+# ============================================
+# MaxRects Bin Packing
+# ============================================
+
+@dataclass
+class MaxRectsBin:
+    """A single sheet packed with the MaxRects algorithm"""
+    width: int
+    height: int
+    free: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.free = [Rect(0, 0, self.width, self.height)]
+
+    def find_position(self, width: int, height: int) -> Optional[tuple]:
+        """
+        Best-short-side-fit: choose the free rectangle that leaves the
+        smallest leftover on its shorter side (ties broken on the long side).
+
+        Returns:
+            (short_side_score, long_side_score, Rect) or None if nothing fits
+        """
+        best = None
+        for free in self.free:
+            if width <= free.width and height <= free.height:
+                leftover_w = free.width - width
+                leftover_h = free.height - height
+                score = (min(leftover_w, leftover_h), max(leftover_w, leftover_h))
+                if best is None or score < best[:2]:
+                    best = (*score, Rect(free.x, free.y, width, height))
+        return best
+
+    def place(self, node: Rect) -> None:
+        """Split every free rectangle overlapping node and prune the list"""
+        new_free = []
+        for free in self.free:
+            if not free.intersects(node):
+                new_free.append(free)
+                continue
+            if node.x > free.x:
+                new_free.append(Rect(free.x, free.y, node.x - free.x, free.height))
+            if node.x + node.width < free.x + free.width:
+                right = node.x + node.width
+                new_free.append(Rect(right, free.y, free.x + free.width - right, free.height))
+            if node.y > free.y:
+                new_free.append(Rect(free.x, free.y, free.width, node.y - free.y))
+            if node.y + node.height < free.y + free.height:
+                bottom = node.y + node.height
+                new_free.append(Rect(free.x, bottom, free.width, free.y + free.height - bottom))
+
+        # Remove free rectangles fully contained in another one
+        self.free = [
+            rect for i, rect in enumerate(new_free)
+            if not any(
+                j != i and other.contains(rect) and (other != rect or j < i)
+                for j, other in enumerate(new_free)
+            )
+        ]
+
+
+def pack_sprites(sprites: list[Sprite], max_size: int, padding: int) -> tuple[list[Placement], list[tuple]]:
+    """
+    Pack sprites into as few sheets as possible.
+
+    Returns:
+        (placements, sheet sizes as (width, height) trimmed to the used area)
+    """
+    # Largest first gives MaxRects the best results
+    ordered = sorted(sprites, key=lambda s: (max(s.width, s.height), s.width * s.height), reverse=True)
+    bins: list[MaxRectsBin] = []
+    placements = []
+
+    for sprite in ordered:
+        width, height = sprite.width + padding, sprite.height + padding
+        if width > max_size or height > max_size:
+            logging.warning(f"Skipping {sprite.key}: {sprite.width}x{sprite.height} exceeds sheet size")
+            continue
+
+        # Try every existing sheet before opening a new one
+        best = None
+        for index, bin_ in enumerate(bins):
+            found = bin_.find_position(width, height)
+            if found and (best is None or found[:2] < best[1][:2]):
+                best = (index, found)
+        if best is None:
+            bins.append(MaxRectsBin(max_size, max_size))
+            best = (len(bins) - 1, bins[-1].find_position(width, height))
+
+        index, (_short, _long, node) = best
+        bins[index].place(node)
+        placements.append(Placement(sprite, index, node.x, node.y))
+
+    sizes = []
+    for index in range(len(bins)):
+        used = [p for p in placements if p.sheet == index]
+        sizes.append((
+            max(p.x + p.sprite.width for p in used),
+            max(p.y + p.sprite.height for p in used),
+        ))
+    return placements, sizes
+
+
+# ============================================
+# Sprite Collection
+# ============================================
+
+def load_sprite(key: str, path: Path) -> Optional[Sprite]:
+    """Read an image's size without decoding it"""
+    try:
+        with Image.open(path) as image:
+            return Sprite(key, path, image.width, image.height)
+    except Exception as e:
+        logging.warning(f"Skipping {path}: {e}")
+        return None
+
+
+def collect_card_sprites(database_path: Path) -> list[Sprite]:
+    """Card sprites keyed by card id, from the exported card database"""
+    with open(database_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    sprites = []
+    for card_id, card in data.get("cards", {}).items():
+        image_url = card.get("imageUrl")
+        if not image_url:
+            continue
+        path = CARD_IMAGES_DIR / image_url
+        if not path.exists():
+            logging.warning(f"{card_id}: image not found: {path}")
+            continue
+        sprite = load_sprite(card_id, path)
+        if sprite:
+            sprites.append(sprite)
+    return sprites
+
+
+def collect_asset_sprites() -> list[Sprite]:
+    """Stone and artifact sprites"""
+    sprites = []
+    for path in sorted(STONES_DIR.glob("*.png")):
+        sprite = load_sprite(f"stone:{path.stem}", path)
+        if sprite:
+            sprites.append(sprite)
+    for path in sorted(ARTIFACTS_DIR.rglob("*.png")):
+        key = f"artifact:{path.parent.name}/{path.stem}"
+        sprite = load_sprite(key, path)
+        if sprite:
+            sprites.append(sprite)
+    return sprites
+
+
+# ============================================
+# Atlas Output
+# ============================================
+
+def build_atlas(
+    sprites: list[Sprite],
+    output_dir: Path,
+    max_size: int,
+    padding: int,
+    quality: int
+) -> dict:
+    """
+    Pack the sprites, write the sheets and the coordinate map.
+
+    Returns:
+        The coordinate map written to atlas.json
+    """
+    placements, sizes = pack_sprites(sprites, max_size, padding)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sheets = [Image.new("RGBA", size, (0, 0, 0, 0)) for size in sizes]
+    frames = {}
+    for placement in placements:
+        sprite = placement.sprite
+        with Image.open(sprite.path) as image:
+            sheets[placement.sheet].paste(image.convert("RGBA"), (placement.x, placement.y))
+        frames[sprite.key] = {
+            "sheet": placement.sheet,
+            "x": placement.x,
+            "y": placement.y,
+            "w": sprite.width,
+            "h": sprite.height,
+            "source": sprite.path.name,
+        }
+
+    sheet_entries = []
+    for index, sheet in enumerate(sheets):
+        name = f"atlas-{index}.webp"
+        sheet.save(output_dir / name, "WEBP", quality=quality, method=6)
+        sheet_entries.append({
+            "file": name,
+            "width": sheet.width,
+            "height": sheet.height,
+            "bytes": (output_dir / name).stat().st_size,
+        })
+
+    atlas = {
+        "version": "1.0.0",
+        "sheets": sheet_entries,
+        "frames": dict(sorted(frames.items())),
+    }
+    with open(output_dir / "atlas.json", "w", encoding="utf-8") as f:
+        json.dump(atlas, f, indent=2, ensure_ascii=False)
+
+    return atlas
+
+
+# ============================================
+# CLI Entry Point
+# ============================================
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Pack card, stone and artifact images into texture atlases"
+    )
+    parser.add_argument(
+        "--database", "-d",
+        type=Path,
+        default=DEFAULT_DATABASE,
+        help=f"Card database from export-cards-json.py (default: {DEFAULT_DATABASE})"
+    )
+    parser.add_argument(
+        "--output-dir", "-o",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help=f"Output directory (default: {DEFAULT_OUTPUT_DIR})"
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=DEFAULT_MAX_SIZE,
+        help=f"Maximum sheet width/height in pixels (default: {DEFAULT_MAX_SIZE})"
+    )
+    parser.add_argument(
+        "--padding",
+        type=int,
+        default=DEFAULT_PADDING,
+        help=f"Transparent gap between sprites (default: {DEFAULT_PADDING})"
+    )
+    parser.add_argument(
+        "--quality", "-q",
+        type=int,
+        default=DEFAULT_QUALITY,
+        help=f"WebP quality of the sheets (default: {DEFAULT_QUALITY})"
+    )
+    parser.add_argument(
+        "--cards-only",
+        action="store_true",
+        help="Only pack card images (skip stones and artifacts)"
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if not args.database.exists():
+        logging.error(f"Card database not found: {args.database} (run export-cards-json.py first)")
+        sys.exit(1)
+
+    sprites = collect_card_sprites(args.database)
+    if not args.cards_only:
+        sprites += collect_asset_sprites()
+
+    if not sprites:
+        logging.error("No images to pack")
+        sys.exit(1)
+
+    atlas = build_atlas(sprites, args.output_dir, args.max_size, args.padding, args.quality)
+
+    source_bytes = sum(s.path.stat().st_size for s in sprites)
+    atlas_bytes = sum(sheet["bytes"] for sheet in atlas["sheets"])
+    print("\n" + "=" * 50)
+    print("Atlas Built")
+    print("=" * 50)
+    print(f"  Sprites packed: {len(atlas['frames'])} of {len(sprites)}")
+    print(f"  Sheets: {len(atlas['sheets'])}")
+    for sheet in atlas["sheets"]:
+        print(f"    {sheet['file']}: {sheet['width']}x{sheet['height']}, {sheet['bytes'] / 1024:.1f} KB")
+    print(f"  Requests: {len(sprites)} -> {len(atlas['sheets']) + 1}")
+    print(f"  Bytes: {source_bytes / 1024:.1f} KB -> {atlas_bytes / 1024:.1f} KB")
+    print(f"  Coordinate map: {args.output_dir / 'atlas.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,8 @@ from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, field, asdict
 
+from asset_index import get_asset_index
+
 
 # ============================================
 # Configuration
@@ -29,6 +31,8 @@ PROJECT_ROOT = Path(r"D:\claude-mode\the-vale-of-eternity")
 CARDS_DIR = PROJECT_ROOT / "src" / "data" / "cards"
 IMAGES_DIR = PROJECT_ROOT / "src" / "cards" / "base"
 DEFAULT_OUTPUT = PROJECT_ROOT / "scripts" / "cards-database.json"
+# Written by generate-card-derivatives.py
+RESPONSIVE_MANIFEST = PROJECT_ROOT / "public" / "cards" / "responsive" / "manifest.json"
 
 
 # ============================================
@@ -179,11 +183,27 @@ def parse_cards_simple(file_path: Path) -> list[dict]:
 
 
 def check_image_exists(image_url: str) -> bool:
-    """Check if the card image exists"""
+    """Check if the card image exists (answered from the shared asset index)"""
     if not image_url:
         return False
     image_path = IMAGES_DIR / image_url
-    return image_path.exists()
+    return get_asset_index().exists(image_path)
+
+
+def load_image_variants() -> dict:
+    """
+    Load responsive image derivatives keyed by imageUrl.
+
+    Returns an empty dict if generate-card-derivatives.py has not been run.
+    """
+    if not RESPONSIVE_MANIFEST.exists():
+        return {}
+    with open(RESPONSIVE_MANIFEST, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return {
+        image_url: entry.get("derivatives", [])
+        for image_url, entry in manifest.get("cards", {}).items()
+    }
 
 
 def export_all_cards(output_path: Path) -> dict:
@@ -197,6 +217,7 @@ def export_all_cards(output_path: Path) -> dict:
         Dictionary containing all card data
     """
     all_cards = {}
+    image_variants = load_image_variants()
 
     # Find all card definition files
     card_files = [
@@ -243,6 +264,10 @@ def export_all_cards(output_path: Path) -> dict:
                     "imageExists": card.get("imageExists", False),
                 }
 
+                # Attach responsive derivatives when they have been generated
+                if image_url in image_variants:
+                    all_cards[card_id]["imageVariants"] = image_variants[image_url]
+
     # Save to JSON
     output_data = {
         "version": "2.0.0",
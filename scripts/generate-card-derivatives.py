@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Responsive Card Art Generator for The Vale of Eternity
+Builds multiple widths and formats (WebP/AVIF) of every card image so that
+hand, board and zoom views can download an appropriately sized file.
+
+The generated manifest is keyed by the card's `imageUrl` and can be read by
+the frontend (it is written under public/) and by export-cards-json.py.
+
+Usage:
+    python generate-card-derivatives.py [--widths 64 100 140 200] [--formats webp avif] [--jobs N]
+
+@version 1.0.0
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import logging
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+
+try:
+    from PIL import Image, features
+except ImportError:
+    print("Error: Pillow not installed. Run: pip install Pillow")
+    sys.exit(1)
+
+
+# ============================================
+# Configuration
+# ============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SOURCE_DIRS = [
+    PROJECT_ROOT / "src" / "cards" / "base",
+    PROJECT_ROOT / "src" / "cards" / "dlc",
+]
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "public" / "cards" / "responsive"
+MANIFEST_NAME = "manifest.json"
+
+# Widths used by the hand, board and zoom views (never upscaled past the source)
+DEFAULT_WIDTHS = [64, 100, 140, 200]
+DEFAULT_FORMATS = ["webp", "avif"]
+
+# Encoder settings per format (part of the cache key)
+FORMAT_OPTIONS = {
+    "webp": {"quality": 80, "method": 6},
+    "avif": {"quality": 60, "speed": 6},
+}
+
+SOURCE_EXTENSIONS = {".webp", ".png", ".jpg", ".jpeg"}
+
+# Files in the output directory that this script generated (e.g. Hestia-100w.avif)
+DERIVATIVE_PATTERN = re.compile(r"-\d+w\.(" + "|".join(FORMAT_OPTIONS) + r")$")
+MANIFEST_VERSION = "1.0.0"
+
+
+# ============================================
+# Data Classes
+# ============================================
+
+@dataclass
+class Derivative:
+    """A single generated file"""
+    width: int
+    height: int
+    format: str
+    path: str
+    bytes: int
+
+
+@dataclass
+class CardArt:
+    """All derivatives generated from one source image"""
+    source: str
+    sourceHash: str
+    width: int
+    height: int
+    settings: str
+    derivatives: list = field(default_factory=list)
+
+
+# ============================================
+# Helpers
+# ============================================
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def settings_key(widths: list[int], formats: list[str]) -> str:
+    """Stable string describing everything that affects the output"""
+    options = {fmt: FORMAT_OPTIONS[fmt] for fmt in formats}
+    return json.dumps({"widths": widths, "formats": options}, sort_keys=True)
+
+
+def available_formats(requested: list[str]) -> list[str]:
+    """Drop formats this Pillow build cannot encode"""
+    formats = []
+    for fmt in requested:
+        if fmt not in FORMAT_OPTIONS:
+            logging.warning(f"Unknown format '{fmt}', skipping")
+        elif not features.check(fmt):
+            logging.warning(f"Pillow was built without {fmt.upper()} support, skipping")
+        else:
+            formats.append(fmt)
+    return formats
+
+
+def find_sources(source_dirs: list[Path]) -> list[Path]:
+    """Collect card images from the source directories"""
+    sources = []
+    for source_dir in source_dirs:
+        if not source_dir.exists():
+            logging.warning(f"Source directory not found: {source_dir}")
+            continue
+        sources.extend(
+            p for p in sorted(source_dir.iterdir())
+            if p.suffix.lower() in SOURCE_EXTENSIONS and p.stat().st_size > 0
+        )
+    return sources
+
+
+def derivative_stem(source: Path) -> str:
+    """e.g. 200px-Hestia.webp -> Hestia"""
+    stem = source.stem
+    if stem.startswith("200px-"):
+        stem = stem[len("200px-"):]
+    return stem
+
+
+def derivative_name(source: Path, width: int, fmt: str) -> str:
+    """e.g. 200px-Hestia.webp -> Hestia-100w.avif"""
+    return f"{derivative_stem(source)}-{width}w.{fmt}"
+
+
+def find_collisions(sources: list[Path]) -> list[tuple[Path, Path]]:
+    """
+    Pairs of sources that would overwrite each other's output.
+
+    Derivatives share one output directory and the manifest is keyed by
+    file name, so e.g. base/200px-Hestia.webp and dlc/Hestia.jpg, or the
+    same file name in two source directories, cannot both be generated.
+    """
+    collisions = []
+    seen = {}
+    for source in sources:
+        for key in {("name", source.name), ("stem", derivative_stem(source).lower())}:
+            if key in seen:
+                collisions.append((seen[key], source))
+            else:
+                seen[key] = source
+    return list(dict.fromkeys(collisions))
+
+
+# ============================================
+# Generation
+# ============================================
+
+def generate_card(
+    source: Path,
+    output_dir: Path,
+    widths: list[int],
+    formats: list[str],
+    source_hash: str,
+    settings: str
+) -> CardArt:
+    """
+    Decode one source image and write every width/format combination.
+
+    Runs in a worker process.
+    """
+    with Image.open(source) as image:
+        image.load()
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    art = CardArt(
+        source=source.name,
+        sourceHash=source_hash,
+        width=image.width,
+        height=image.height,
+        settings=settings,
+    )
+
+    # Never upscale: widths above the source collapse onto the source width
+    targets = sorted({min(w, image.width) for w in widths})
+
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize(
+            (width, height), Image.Resampling.LANCZOS
+        )
+        for fmt in formats:
+            name = derivative_name(source, width, fmt)
+            out_path = output_dir / name
+            resized.save(out_path, fmt.upper(), **FORMAT_OPTIONS[fmt])
+            art.derivatives.append(asdict(Derivative(
+                width=width,
+                height=height,
+                format=fmt,
+                path=name,
+                bytes=out_path.stat().st_size,
+            )))
+
+    return art
+
+
+def load_manifest(manifest_path: Path) -> dict:
+    """Load the previous manifest, or an empty one"""
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == MANIFEST_VERSION:
+            return data
+    return {"version": MANIFEST_VERSION, "cards": {}}
+
+
+def is_cached(entry: dict, source_hash: str, settings: str, output_dir: Path) -> bool:
+    """True if an entry is current and all of its files still exist"""
+    if not entry or entry.get("sourceHash") != source_hash or entry.get("settings") != settings:
+        return False
+    return all((output_dir / d["path"]).exists() for d in entry.get("derivatives", []))
+
+
+def prune_derivatives(output_dir: Path, cards: dict) -> int:
+    """
+    Delete generated files that no manifest entry references (removed or
+    renamed sources, widths or formats no longer requested).
+
+    Returns:
+        Number of files deleted
+    """
+    referenced = {d["path"] for card in cards.values() for d in card.get("derivatives", [])}
+    removed = 0
+    for path in output_dir.iterdir():
+        if path.is_file() and DERIVATIVE_PATTERN.search(path.name) and path.name not in referenced:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def generate_all(
+    source_dirs: list[Path],
+    output_dir: Path,
+    widths: list[int],
+    formats: list[str],
+    jobs: int,
+    force: bool = False
+) -> dict:
+    """
+    Generate derivatives for every card image, in parallel and with caching.
+
+    Returns:
+        The written manifest
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    settings = settings_key(widths, formats)
+
+    sources = find_sources(source_dirs)
+    logging.info(f"Found {len(sources)} source images")
+
+    collisions = find_collisions(sources)
+    if collisions:
+        listing = ", ".join(f"{a} / {b}" for a, b in collisions)
+        raise ValueError(f"Source images would write the same derivatives: {listing}")
+
+    pending = []
+    cards = {}
+    for source in sources:
+        source_hash = file_hash(source)
+        entry = manifest["cards"].get(source.name)
+        if not force and is_cached(entry, source_hash, settings, output_dir):
+            cards[source.name] = entry
+        else:
+            pending.append((source, source_hash))
+
+    logging.info(f"Up to date: {len(cards)}, to generate: {len(pending)}")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(generate_card, source, output_dir, widths, formats, source_hash, settings): source
+            for source, source_hash in pending
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            source = futures[future]
+            try:
+                cards[source.name] = asdict(future.result())
+                logging.info(f"[{i}/{len(pending)}] {source.name}")
+            except Exception as e:
+                logging.error(f"Failed to process {source}: {e}")
+                # Keep the previous derivatives (still on disk) listed rather than dropping the card
+                if source.name in manifest["cards"]:
+                    cards[source.name] = manifest["cards"][source.name]
+    elapsed = time.perf_counter() - start
+
+    if pending:
+        logging.info(f"Generated {len(pending)} cards in {elapsed:.2f}s "
+                     f"({len(pending) / elapsed:.1f} cards/s)")
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "widths": widths,
+        "formats": formats,
+        "cards": dict(sorted(cards.items())),
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    removed = prune_derivatives(output_dir, manifest["cards"])
+    if removed:
+        logging.info(f"Removed {removed} stale derivative files")
+
+    return manifest
+
+
+# ============================================
+# CLI Entry Point
+# ============================================
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Generate multi-size WebP/AVIF derivatives of card art"
+    )
+    parser.add_argument(
+        "--source-dir", "-s",
+        type=Path,
+        action="append",
+        help="Directory containing source card art (repeatable, default: src/cards/base and src/cards/dlc)"
+    )
+    parser.add_argument(
+        "--output-dir", "-o",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help=f"Output directory (default: {DEFAULT_OUTPUT_DIR})"
+    )
+    parser.add_argument(
+        "--widths", "-w",
+        type=int,
+        nargs="+",
+        default=DEFAULT_WIDTHS,
+        help=f"Target widths in pixels (default: {DEFAULT_WIDTHS})"
+    )
+    parser.add_argument(
+        "--formats", "-f",
+        nargs="+",
+        default=DEFAULT_FORMATS,
+        help=f"Output formats (default: {DEFAULT_FORMATS})"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate everything, ignoring the cache"
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    formats = available_formats(args.formats)
+    if not formats:
+        logging.error("No usable output formats")
+        sys.exit(1)
+
+    try:
+        manifest = generate_all(
+            args.source_dir or DEFAULT_SOURCE_DIRS,
+            args.output_dir,
+            sorted(set(args.widths)),
+            formats,
+            args.jobs,
+            args.force,
+        )
+    except ValueError as e:
+        logging.error(f"{e} (rename one of them)")
+        sys.exit(1)
+
+    total_bytes = sum(
+        d["bytes"] for card in manifest["cards"].values() for d in card["derivatives"]
+    )
+    print("\n" + "=" * 50)
+    print("Derivatives Generated")
+    print("=" * 50)
+    print(f"  Cards: {len(manifest['cards'])}")
+    print(f"  Widths: {manifest['widths']}")
+    print(f"  Formats: {manifest['formats']}")
+    print(f"  Total size: {total_bytes / 1024:.1f} KB")
+    print(f"  Manifest: {args.output_dir / MANIFEST_NAME}")
+
+
+if __name__ == "__main__":
+    main()
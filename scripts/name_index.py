@@ -0,0 +1,154 @@
+"""
+Card Name Index for The Vale of Eternity card data
+Looks up cards by name without scanning the whole catalog for every image.
+
+Exact lookups go through a dict keyed by the case-folded name. Anything
+else falls back to fuzzy matching: every English and Traditional Chinese
+name is split into character trigrams, an inverted index maps each trigram
+to the names containing it, and candidates are ranked by the Dice
+similarity of their trigram sets. Only names sharing a trigram with the
+query are scored, so lookups stay cheap as DLC and promo sets grow.
+
+Usage (from another script in this directory):
+    from name_index import NameIndex
+
+    index = NameIndex.from_cards(cards)     # {card_id: {"name", "nameTw", ...}}
+    index.exact("Hestia")                   # -> "F001"
+    index.fuzzy("Hornedsalamander")         # -> [(1.0, "F006", "Horned Salamander"), ...]
+    card_id, candidates = index.match("Gobln Soldier")   # -> "E009", [...]
+
+@version 1.0.0
+"""
+
+import re
+from collections import Counter
+from typing import Optional
+
+
+# ============================================
+# Configuration
+# ============================================
+
+NAME_FIELDS = ("name", "nameTw")
+
+# Dice similarity (0-1) a fuzzy candidate needs to be returned, and the score
+# and lead over the runner-up at which the best one is trusted as a match.
+# Filename-derived names of the base set score 1.0 against their own card
+# and at most 0.71 against another; single-letter typos score 0.65-0.85.
+MIN_SCORE = 0.4
+ACCEPT_SCORE = 0.6
+MIN_MARGIN = 0.1
+MAX_CANDIDATES = 5
+
+
+# ============================================
+# Helpers
+# ============================================
+
+def normalize_name(name: str) -> str:
+    """Case-folded name with whitespace collapsed (the exact-match key)"""
+    return " ".join(name.casefold().split())
+
+
+def trigrams(name: str) -> set[str]:
+    """
+    Character trigrams of a name, ignoring case, spaces and punctuation.
+
+    The name is padded so that its first and last characters also form
+    trigrams of their own, which keeps short names (and the four-character
+    Chinese names) matchable.
+    """
+    compact = re.sub(r"[\W_]+", "", name.casefold())
+    if not compact:
+        return set()
+    padded = f"  {compact} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# ============================================
+# Name Index
+# ============================================
+
+class NameIndex:
+    """Exact and trigram-fuzzy card lookup by English or Chinese name"""
+
+    def __init__(self):
+        self.by_name: dict[str, str] = {}
+        self.entries: list[tuple[str, str, int]] = []   # (card id, name, trigram count)
+        self.postings: dict[str, list[int]] = {}        # trigram -> entry numbers
+
+    @classmethod
+    def from_cards(cls, cards: dict) -> "NameIndex":
+        """Index the NAME_FIELDS of an id -> card map (the cards are not modified)"""
+        index = cls()
+        for card_id, card in cards.items():
+            for key in NAME_FIELDS:
+                if card.get(key):
+                    index.add(card_id, card[key])
+        return index
+
+    def add(self, card_id: str, name: str) -> None:
+        key = normalize_name(name)
+        if not key:
+            return
+        # The first card keeps a name shared by several cards
+        self.by_name.setdefault(key, card_id)
+
+        grams = trigrams(name)
+        entry = len(self.entries)
+        self.entries.append((card_id, name, len(grams)))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(entry)
+
+    def exact(self, name: str) -> Optional[str]:
+        """Card id whose name or nameTw equals name (ignoring case and spacing)"""
+        return self.by_name.get(normalize_name(name))
+
+    def fuzzy(self, name: str, limit: int = MAX_CANDIDATES, min_score: float = MIN_SCORE) -> list[tuple]:
+        """
+        Cards whose names share the most trigrams with name.
+
+        Returns:
+            [(score 0-1, card id, matched name), ...] best first, one entry per card
+        """
+        grams = trigrams(name)
+        if not grams:
+            return []
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        best = {}
+        for entry, count in shared.items():
+            card_id, text, size = self.entries[entry]
+            score = 2 * count / (len(grams) + size)
+            if score >= min_score and score > best.get(card_id, (0.0,))[0]:
+                best[card_id] = (score, text)
+
+        ranked = sorted(((score, card_id, text) for card_id, (score, text) in best.items()),
+                        key=lambda candidate: (-candidate[0], candidate[1]))
+        return ranked[:limit]
+
+    def match(self, name: str) -> tuple[Optional[str], list[tuple]]:
+        """
+        Card a name most likely refers to.
+
+        Returns:
+            (card id or None if no candidate clearly wins, fuzzy candidates;
+            the candidates are empty on an exact match)
+        """
+        card_id = self.exact(name)
+        if card_id is not None:
+            return card_id, []
+
+        candidates = self.fuzzy(name)
+        if candidates:
+            best = candidates[0][0]
+            second = candidates[1][0] if len(candidates) > 1 else 0.0
+            if best >= ACCEPT_SCORE and best - second >= MIN_MARGIN:
+                return candidates[0][1], candidates
+        return None, candidates
+
+    def __len__(self) -> int:
+        return len(self.entries)
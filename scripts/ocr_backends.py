@@ -0,0 +1,246 @@
+"""
+OCR Backends for the card analyzer
+A small interface over the two ways of running tesseract from Python.
+
+- pytesseract: runs the tesseract executable once per call (writes the image
+  to a temporary file and reloads the language data every time). Always
+  available, used as the fallback.
+- tesserocr: calls the tesseract C API in-process. Each process keeps one
+  engine per language string, initialized on first use and reused for every
+  later call with that language; images are handed over as in-memory buffers.
+
+Both return the same shapes as pytesseract (`image_to_string` text and the
+`image_to_data` dict), so callers do not care which one is active.
+
+Usage (from another script in this directory):
+    from ocr_backends import get_ocr_backend
+
+    ocr = get_ocr_backend("auto")
+    text = ocr.image_to_string(image, config="--psm 6 --oem 3")
+
+@version 1.0.0
+"""
+
+import os
+import shlex
+import logging
+from typing import Optional
+
+from PIL import Image
+
+import pytesseract
+
+try:
+    import tesserocr
+except ImportError:  # optional, pytesseract is used instead
+    tesserocr = None
+
+
+# ============================================
+# Configuration
+# ============================================
+
+BACKEND_NAMES = ["auto", "tesserocr", "pytesseract"]
+
+# Language used when a call names none (tesseract's default, as with pytesseract)
+DEFAULT_LANG = "eng"
+
+DATA_KEYS = ["level", "block_num", "par_num", "line_num", "word_num",
+             "left", "top", "width", "height", "conf", "text"]
+
+
+# ============================================
+# Config Parsing
+# ============================================
+
+def parse_config(config: str) -> tuple[Optional[int], Optional[str], dict]:
+    """
+    Split a tesseract command-line config into its parts.
+
+    Returns:
+        (page segmentation mode, languages from -l, {variable: value} from -c)
+    """
+    psm, lang, variables = None, None, {}
+    args = shlex.split(config)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        value = args[i + 1] if i + 1 < len(args) else ""
+        if arg == "--psm":
+            psm = int(value)
+            i += 1
+        elif arg == "-l":
+            lang = value
+            i += 1
+        elif arg == "-c" and "=" in value:
+            key, _sep, val = value.partition("=")
+            variables[key] = val
+            i += 1
+        # --oem is fixed when the engine is created and is ignored here
+        i += 1
+    return psm, lang, variables
+
+
+# ============================================
+# Backends
+# ============================================
+
+def tesserocr_languages() -> set[str]:
+    """
+    Languages tesserocr can load, without creating an engine.
+
+    Raises:
+        RuntimeError: tesserocr is missing or lacks the default language
+    """
+    if tesserocr is None:
+        raise RuntimeError("tesserocr not installed. Run: pip install tesserocr")
+    _path, installed = tesserocr.get_languages()
+    if DEFAULT_LANG not in installed:
+        raise RuntimeError(f"Tesseract language data not installed: {DEFAULT_LANG}")
+    return set(installed)
+
+
+class OcrBackend:
+    """Interface shared by all OCR backends"""
+    name = "base"
+
+    def image_to_string(self, image: Image.Image, config: str = "", lang: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+    def image_to_data(self, image: Image.Image, config: str = "", lang: Optional[str] = None) -> dict:
+        """Word boxes in pytesseract's Output.DICT layout"""
+        raise NotImplementedError
+
+
+class PytesseractBackend(OcrBackend):
+    """One tesseract subprocess per call"""
+    name = "pytesseract"
+
+    def image_to_string(self, image, config="", lang=None):
+        return pytesseract.image_to_string(image, lang=lang, config=config)
+
+    def image_to_data(self, image, config="", lang=None):
+        return pytesseract.image_to_data(
+            image, lang=lang, config=config, output_type=pytesseract.Output.DICT
+        )
+
+
+class TesserocrBackend(OcrBackend):
+    """In-process tesseract API with engines kept alive for the life of the process"""
+    name = "tesserocr"
+
+    def __init__(self):
+        self.installed = tesserocr_languages()
+        self.engines = {}
+
+    def _engine(self, lang: Optional[str]):
+        """Engine for exactly the requested language string, created on first use"""
+        lang = lang or DEFAULT_LANG
+        if lang not in self.engines:
+            missing = [name for name in lang.split("+") if name not in self.installed]
+            if missing:
+                raise RuntimeError(f"Tesseract language data not installed: {', '.join(missing)}")
+            self.engines[lang] = tesserocr.PyTessBaseAPI(lang=lang)
+            logging.debug(f"tesserocr engine ready ({lang}) in process {os.getpid()}")
+        return self.engines[lang]
+
+    def _run(self, image: Image.Image, config: str, lang: Optional[str]):
+        """Configure the engine for one call; returns (api, previous variable values)"""
+        psm, config_lang, variables = parse_config(config)
+        api = self._engine(lang or config_lang)
+        previous = {key: api.GetVariableAsString(key) for key in variables}
+        for key, value in variables.items():
+            api.SetVariable(key, value)
+        api.SetPageSegMode(psm if psm is not None else tesserocr.PSM.AUTO)
+        api.SetImage(image)
+        api.Recognize()
+        return api, previous
+
+    @staticmethod
+    def _restore(api, previous: dict) -> None:
+        for key, value in previous.items():
+            api.SetVariable(key, value or "")
+
+    def image_to_string(self, image, config="", lang=None):
+        api, previous = self._run(image, config, lang)
+        try:
+            return api.GetUTF8Text()
+        finally:
+            self._restore(api, previous)
+
+    def image_to_data(self, image, config="", lang=None):
+        api, previous = self._run(image, config, lang)
+        data = {key: [] for key in DATA_KEYS}
+        try:
+            level = tesserocr.RIL.WORD
+            block = par = line = word = 0
+            iterator = api.GetIterator()
+            for result in tesserocr.iterate_level(iterator, level):
+                if result.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                    block, par, line, word = block + 1, 0, 0, 0
+                if result.IsAtBeginningOf(tesserocr.RIL.PARA):
+                    par, line, word = par + 1, 0, 0
+                if result.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line, word = line + 1, 0
+                word += 1
+                box = result.BoundingBox(level)
+                if box is None:
+                    continue
+                left, top, right, bottom = box
+                values = [5, block, par, line, word, left, top, right - left, bottom - top,
+                          result.Confidence(level), result.GetUTF8Text(level) or ""]
+                for key, value in zip(DATA_KEYS, values):
+                    data[key].append(value)
+        finally:
+            self._restore(api, previous)
+        return data
+
+
+# ============================================
+# Backend Selection
+# ============================================
+
+_backend: Optional[OcrBackend] = None
+_backend_pid: Optional[int] = None
+
+
+def create_backend(name: str = "auto") -> OcrBackend:
+    """Create a backend by name; "auto" prefers tesserocr and falls back to pytesseract"""
+    if name == "pytesseract":
+        return PytesseractBackend()
+    try:
+        return TesserocrBackend()
+    except Exception as e:
+        if name == "tesserocr":
+            raise
+        logging.debug(f"tesserocr unavailable ({e}), using pytesseract")
+        return PytesseractBackend()
+
+
+def get_ocr_backend(name: Optional[str] = None) -> OcrBackend:
+    """
+    Process-wide backend.
+
+    Passing a name (re)selects the backend. Engines are never shared across
+    processes: a forked worker creates its own on first use.
+    """
+    global _backend, _backend_pid
+    if name is not None and (_backend is None or name not in ("auto", _backend.name)):
+        _backend = create_backend(name)
+        _backend_pid = os.getpid()
+    elif _backend is None or _backend_pid != os.getpid():
+        _backend = create_backend(_backend.name if _backend else "auto")
+        _backend_pid = os.getpid()
+    return _backend
+
+
+def available_backends() -> list[str]:
+    """Names of the backends that can actually run here"""
+    names = []
+    try:
+        tesserocr_languages()
+        names.append("tesserocr")
+    except Exception:
+        pass
+    names.append("pytesseract")
+    return names
@@ -0,0 +1,185 @@
+"""
+Persistent OCR Result Cache for the card analyzer
+Remembers the output of every OCR call so re-runs only pay for regions whose
+image, crop, preprocessing or tesseract config actually changed.
+
+Entries are keyed by a hash of (image content hash, region, preprocessing
+version, backend, config, language) and stored in a small SQLite database,
+which is safe to share between the worker processes of `--jobs`. When the
+stored results exceed the size limit, the least recently used entries are
+evicted.
+
+Usage (from another script in this directory):
+    from ocr_cache import configure_ocr_cache, get_ocr_cache
+
+    configure_ocr_cache(max_mb=64)
+    cache = get_ocr_cache()
+    text = cache.get_or_compute((sha256, region, 1, "pytesseract", config, None), run_ocr)
+    print(cache.stats())
+
+@version 1.0.0
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Optional
+
+
+# ============================================
+# Configuration
+# ============================================
+
+DEFAULT_CACHE = Path(__file__).resolve().parent / "ocr-cache.sqlite3"
+DEFAULT_MAX_MB = 64
+EVICT_EVERY = 200      # puts between size checks
+EVICT_TO = 0.9         # fraction of the limit kept after an eviction
+CACHE_VERSION = 1
+
+
+# ============================================
+# OCR Cache
+# ============================================
+
+class OcrCache:
+    """Size-bounded LRU cache of OCR results backed by SQLite"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE, max_mb: float = DEFAULT_MAX_MB):
+        self.path = Path(path)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._puts = 0
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS ocr ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS ocr_last_used ON ocr (last_used)")
+        self.db.commit()
+
+    @staticmethod
+    def make_key(parts: tuple) -> str:
+        """Stable key for any JSON-serializable tuple of key parts"""
+        raw = json.dumps([CACHE_VERSION, *parts], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Cached value for key (JSON-decoded), or None"""
+        row = self.db.execute("SELECT value FROM ocr WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.db.execute("UPDATE ocr SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, value) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        self.db.execute(
+            "INSERT OR REPLACE INTO ocr (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, data, len(data.encode("utf-8")), time.time())
+        )
+        self.db.commit()
+        self._puts += 1
+        if self._puts % EVICT_EVERY == 0:
+            self.evict()
+
+    def get_or_compute(self, parts: tuple, compute: Callable):
+        """Return the cached result for parts, running compute() on a miss"""
+        key = self.make_key(parts)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def total_bytes(self) -> int:
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM ocr").fetchone()[0]
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache is under its limit"""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return 0
+        target = total - int(self.max_bytes * EVICT_TO)
+        freed, keys = 0, []
+        for key, size in self.db.execute("SELECT key, size FROM ocr ORDER BY last_used"):
+            keys.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self.db.executemany("DELETE FROM ocr WHERE key = ?", keys)
+        self.db.commit()
+        self.evicted += len(keys)
+        logging.debug(f"OCR cache: evicted {len(keys)} entries ({freed} bytes)")
+        return len(keys)
+
+    def stats(self) -> dict:
+        """Hit/miss counts for this process plus the cache's current size"""
+        entries = self.db.execute("SELECT COUNT(*) FROM ocr").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evicted": self.evicted,
+            "entries": entries,
+            "bytes": self.total_bytes(),
+        }
+
+    def clear(self) -> None:
+        self.db.execute("DELETE FROM ocr")
+        self.db.commit()
+
+    def close(self) -> None:
+        self.evict()
+        self.db.close()
+
+
+# ============================================
+# Process-wide Cache
+# ============================================
+
+_settings: Optional[dict] = {"path": DEFAULT_CACHE, "max_mb": DEFAULT_MAX_MB}
+_cache: Optional[OcrCache] = None
+_cache_pid: Optional[int] = None
+
+
+def configure_ocr_cache(path: Path = DEFAULT_CACHE, max_mb: float = DEFAULT_MAX_MB, enabled: bool = True) -> None:
+    """Set where the process-wide cache lives (or disable it) before first use"""
+    global _settings, _cache
+    if _cache is not None and _cache_pid == os.getpid():
+        _cache.close()
+    _cache = None
+    _settings = {"path": Path(path), "max_mb": max_mb} if enabled else None
+
+
+def ocr_cache_settings() -> Optional[dict]:
+    """Current settings, for passing to worker processes"""
+    return dict(_settings) if _settings else None
+
+
+def get_ocr_cache() -> Optional[OcrCache]:
+    """
+    Process-wide cache, or None when disabled.
+
+    SQLite connections are not shared across processes: a forked worker
+    opens its own connection on first use.
+    """
+    global _cache, _cache_pid
+    if _settings is None:
+        return None
+    if _cache is None or _cache_pid != os.getpid():
+        _cache = OcrCache(**_settings)
+        _cache_pid = os.getpid()
+    return _cache
@@ -0,0 +1,188 @@
+"""
+Perceptual Hash Index for The Vale of Eternity card art
+Matches images to known cards by appearance rather than filename, so
+renamed, recompressed or re-exported art still resolves to the right card.
+
+Hashes are 64-bit dHash/pHash values stored in a BK-tree, which answers
+"all hashes within Hamming distance d" without comparing against every
+entry.
+
+Usage (from another script in this directory):
+    from phash_index import PerceptualIndex
+
+    index = PerceptualIndex.from_images({"F001": path_to_hestia, ...})
+    index.nearest(Path("renamed.webp"))      # -> [(distance, "F001"), ...]
+    index.near_duplicates()                  # -> [(distance, key_a, key_b), ...]
+
+@version 1.0.0
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from PIL import Image
+
+
+# ============================================
+# Configuration
+# ============================================
+
+HASH_SIZE = 8          # 8x8 -> 64-bit hashes
+PHASH_SAMPLE = 32      # pHash DCT input size
+DEFAULT_MAX_DISTANCE = 5     # recompressed/resized copies measure <= 2, distinct cards >= 6
+DUPLICATE_DISTANCE = 3
+
+
+# ============================================
+# Hash Functions
+# ============================================
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def dhash(image: Image.Image, size: int = HASH_SIZE) -> int:
+    """Difference hash: sign of horizontal gradients on a (size+1) x size thumbnail"""
+    gray = image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.int16)
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+_DCT = _dct_matrix(PHASH_SAMPLE)
+
+
+def phash(image: Image.Image, size: int = HASH_SIZE) -> int:
+    """Perceptual hash: low-frequency DCT coefficients compared to their median"""
+    gray = image.convert("L").resize((PHASH_SAMPLE, PHASH_SAMPLE), Image.Resampling.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.float64)
+    coefficients = _DCT @ pixels @ _DCT.T
+    low = coefficients[:size, :size].ravel()
+    # Exclude the DC term from the median so overall brightness does not matter
+    return _bits_to_int(low > np.median(low[1:]))
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+# ============================================
+# BK-Tree
+# ============================================
+
+class BKTree:
+    """Metric tree over integer hashes using Hamming distance"""
+
+    def __init__(self):
+        self.root: Optional[list] = None  # [hash, [values], {distance: child}]
+        self.size = 0
+
+    def add(self, value_hash: int, value) -> None:
+        self.size += 1
+        if self.root is None:
+            self.root = [value_hash, [value], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value_hash, node[0])
+            if distance == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value_hash, [value], {}]
+                return
+            node = child
+
+    def search(self, value_hash: int, max_distance: int) -> list[tuple]:
+        """All (distance, value) within max_distance, closest first"""
+        results = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value_hash, node[0])
+            if distance <= max_distance:
+                results.extend((distance, value) for value in node[1])
+            # Triangle inequality: only children in [d - max, d + max] can match
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in node[2].items() if low <= d <= high)
+        return sorted(results, key=lambda r: (r[0], str(r[1])))
+
+
+# ============================================
+# Perceptual Index
+# ============================================
+
+class PerceptualIndex:
+    """pHash lookup of card images, with dHash as a tie-breaker"""
+
+    def __init__(self):
+        self.tree = BKTree()
+        self.hashes: dict = {}  # key -> (phash, dhash)
+
+    @staticmethod
+    def hash_image(source: Union[Path, Image.Image]) -> tuple[int, int]:
+        if isinstance(source, Image.Image):
+            return phash(source), dhash(source)
+        with Image.open(source) as image:
+            image = image.convert("RGB")
+            return phash(image), dhash(image)
+
+    @classmethod
+    def from_images(cls, images: dict) -> "PerceptualIndex":
+        """Build an index from {key: image path}; unreadable files are skipped"""
+        index = cls()
+        for key, path in images.items():
+            try:
+                index.add(key, path)
+            except Exception:
+                continue
+        return index
+
+    def add(self, key, source: Union[Path, Image.Image, tuple]) -> None:
+        """Index an image (or a precomputed (phash, dhash) pair) under key"""
+        hashes = source if isinstance(source, tuple) else self.hash_image(source)
+        self.hashes[key] = hashes
+        self.tree.add(hashes[0], key)
+
+    def nearest(
+        self,
+        source: Union[Path, Image.Image, tuple],
+        max_distance: int = DEFAULT_MAX_DISTANCE
+    ) -> list[tuple]:
+        """
+        Known keys that look like the given image.
+
+        Args:
+            source: Image path, decoded image or precomputed (phash, dhash) pair
+            max_distance: Largest pHash Hamming distance to accept
+
+        Returns:
+            [(pHash distance, key), ...] closest first; ties on pHash are
+            ordered by dHash distance
+        """
+        p_hash, d_hash = source if isinstance(source, tuple) else self.hash_image(source)
+        hits = self.tree.search(p_hash, max_distance)
+        return sorted(hits, key=lambda hit: (hit[0], hamming(d_hash, self.hashes[hit[1]][1])))
+
+    def near_duplicates(self, max_distance: int = DUPLICATE_DISTANCE) -> list[tuple]:
+        """Pairs of indexed images that are perceptually (nearly) identical"""
+        pairs = set()
+        for key, (p_hash, _d) in self.hashes.items():
+            for distance, other in self.tree.search(p_hash, max_distance):
+                if other != key:
+                    a, b = sorted((str(key), str(other)))
+                    pairs.add((distance, a, b))
+        return sorted(pairs)
@@ -0,0 +1,170 @@
+"""
+分層去背: 先用便宜的白色門檻去背並評分, 只有評分不合格的圖片才交給 rembg
+
+評分依據:
+  - border:   去背後圖片外框仍不透明的比例 (背景不是白色時會很高)
+  - residual: 透明區域邊緣上仍殘留接近白色像素的比例 (白邊/光暈)
+  - rough:    alpha 邊緣長度相對於同面積圓周長的倍數 (邊緣鋸齒、雜點)
+
+Usage:
+    python tiered_remove_bg.py --all
+    python tiered_remove_bg.py public/assets/stones --max-residual 0.1 --model u2netp
+"""
+import numpy as np
+from functools import partial
+import argparse
+import math
+
+from bg_batch import add_batch_arguments, plan_outputs, resolve_inputs, run_batch
+from bg_manifest import add_manifest_arguments, open_manifest
+from remove_bg import (DEFAULT_MAX_MEMORY_MB, DEFAULT_THRESHOLD, add_mode_arguments, key_image,
+                       mode_params, open_rgba)
+
+# 評分門檻 (超過任一項就升級到 rembg)
+DEFAULT_MAX_BORDER = 0.05
+DEFAULT_MAX_RESIDUAL = 0.15
+DEFAULT_MAX_ROUGHNESS = 3.0
+
+# 邊緣像素三個通道都高於此值即視為殘留的白邊
+RESIDUAL_FLOOR = 200
+
+
+class TierScore:
+    """便宜去背的評分結果"""
+
+    def __init__(self, border, residual, roughness, escalate):
+        self.border = border
+        self.residual = residual
+        self.roughness = roughness
+        self.escalate = escalate
+
+    def __str__(self):
+        tier = 'rembg' if self.escalate else 'threshold'
+        return (f'[{tier}: border={self.border:.2f} residual={self.residual:.2f} '
+                f'rough={self.roughness:.2f}]')
+
+
+def score_keyed(rgba, max_border=DEFAULT_MAX_BORDER, max_residual=DEFAULT_MAX_RESIDUAL,
+                max_roughness=DEFAULT_MAX_ROUGHNESS):
+    """
+    為門檻去背後的 RGBA 陣列評分
+
+    Args:
+        rgba: shape 為 (H, W, 4) 的 uint8 陣列
+        max_border / max_residual / max_roughness: 各項評分的上限
+
+    Returns:
+        TierScore
+    """
+    opaque = rgba[..., 3] > 0
+    area = int(opaque.sum())
+    if area == 0:
+        # 整張都被去掉了, 門檻去背顯然失敗
+        return TierScore(0.0, 1.0, 0.0, True)
+
+    # 外框仍不透明的比例
+    border = np.concatenate([opaque[0], opaque[-1], opaque[1:-1, 0], opaque[1:-1, -1]])
+    border_ratio = float(border.mean())
+
+    # 與透明像素相鄰的不透明像素 = alpha 邊緣 (圖片外側不算透明)
+    padded = np.pad(~opaque, 1, constant_values=False)
+    touches_clear = (padded[:-2, 1:-1] | padded[2:, 1:-1] | padded[1:-1, :-2] | padded[1:-1, 2:])
+    edge = opaque & touches_clear
+    edge_count = int(edge.sum())
+
+    light = rgba[..., :3].min(axis=-1) > RESIDUAL_FLOOR
+    residual = float((edge & light).sum()) / edge_count if edge_count else 0.0
+    roughness = edge_count / (2.0 * math.sqrt(math.pi * area))
+
+    escalate = border_ratio > max_border or residual > max_residual or roughness > max_roughness
+    return TierScore(border_ratio, residual, roughness, escalate)
+
+
+def threshold_tier(input_path, output_path, threshold=DEFAULT_THRESHOLD,
+                   max_memory_mb=DEFAULT_MAX_MEMORY_MB, limits=None, dry_run=False, **mode_kwargs):
+    """
+    第一層: 門檻去背並評分, 合格才寫出結果
+
+    mode_kwargs 會轉交給 remove_bg.key_image (mode / softness / feather)
+
+    Returns:
+        TierScore (escalate 為 True 或 dry_run 時不會寫出檔案)
+    """
+    img = open_rgba(input_path)
+    key_image(img, threshold, max_memory_mb=max_memory_mb, **mode_kwargs)
+    score = score_keyed(np.asarray(img), **(limits or {}))
+    if not score.escalate and not dry_run:
+        img.save(output_path, 'PNG')
+    return score
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分層去背: 門檻去背不合格時才使用 rembg')
+    parser.add_argument('--threshold', '-t', type=int, default=DEFAULT_THRESHOLD,
+                        help=f'白色門檻 0-255 (預設: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--max-memory', type=float, default=DEFAULT_MAX_MEMORY_MB,
+                        help=f'每個 worker 去背暫存的記憶體上限 MB (預設: {DEFAULT_MAX_MEMORY_MB})')
+    add_mode_arguments(parser)
+    parser.add_argument('--max-border', type=float, default=DEFAULT_MAX_BORDER,
+                        help=f'外框不透明比例上限 (預設: {DEFAULT_MAX_BORDER})')
+    parser.add_argument('--max-residual', type=float, default=DEFAULT_MAX_RESIDUAL,
+                        help=f'邊緣殘留白邊比例上限 (預設: {DEFAULT_MAX_RESIDUAL})')
+    parser.add_argument('--max-roughness', type=float, default=DEFAULT_MAX_ROUGHNESS,
+                        help=f'alpha 邊緣粗糙度上限 (預設: {DEFAULT_MAX_ROUGHNESS})')
+    parser.add_argument('--model', '-m', default='u2net',
+                        help='升級時使用的 rembg 模型 (預設: u2net)')
+    parser.add_argument('--batch-size', '-b', type=int, default=8,
+                        help='rembg 每次推論的圖片數 (預設: 8)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='只評分, 不寫出任何檔案也不執行 rembg')
+    add_batch_arguments(parser)
+    add_manifest_arguments(parser)
+    args = parser.parse_args()
+
+    limits = {
+        'max_border': args.max_border,
+        'max_residual': args.max_residual,
+        'max_roughness': args.max_roughness,
+    }
+
+    inputs = resolve_inputs(args)
+    jobs = plan_outputs(inputs, args.output_dir)
+
+    manifest = open_manifest(args)
+    if manifest:
+        params = {'tool': 'tiered_remove_bg', 'threshold': args.threshold, 'model': args.model,
+                  **limits, **mode_params(args)}
+        jobs = manifest.plan(jobs, params, args.force, store_originals=not args.dry_run)
+
+    # 第一層: 門檻去背 + 評分
+    task = partial(threshold_tier, threshold=args.threshold, max_memory_mb=args.max_memory,
+                   limits=limits, dry_run=args.dry_run, **mode_params(args))
+    results = run_batch(task, jobs, args.workers, dry_run=args.dry_run)
+    kept = [r for r in results if r.error is None and not r.info.escalate]
+    escalated = [(r.input, r.output) for r in results if r.error is None and r.info.escalate]
+
+    # 第二層: 只有不合格的圖片才載入 rembg
+    ai_results = []
+    if escalated and not args.dry_run:
+        from ai_remove_bg import ai_remove_batch, load_session
+
+        print(f'Escalating {len(escalated)} image(s) to rembg ({args.model})')
+        if (args.workers or 1) == 1:
+            load_session(args.model)
+        ai_task = partial(ai_remove_batch, model_name=args.model)
+        ai_results = run_batch(ai_task, escalated, args.workers, batch_size=max(args.batch_size, 1))
+
+    if manifest and not args.dry_run:
+        manifest.record(kept + ai_results)
+        manifest.save()
+
+    scored = len(kept) + len(escalated)
+    if scored:
+        print(f'Threshold tier: {len(kept)}/{scored}, rembg tier: {len(escalated)}/{scored} '
+              f'({len(escalated) / scored:.0%} escalated)')
+
+    print('All done!')
+
+
+if __name__ == '__main__':
+    main()